@@ -0,0 +1,37 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Local stand-in for a real alert webhook: run it, point UPWORK_ALERT_WEBHOOK at it
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+class AlertHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        self.send_response(204)
+        self.end_headers()
+
+        job = payload.get("job", {})
+        latency = time.time() - payload.get("discoveredAt", time.time())
+        print(f"🔔 [{payload.get('criteria')}] {job.get('title')} ({job.get('budget')})")
+        print(f"   {job.get('url')}")
+        print(f"   discovered {latency:.2f}s ago")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    server = HTTPServer((HOST, PORT), AlertHandler)
+    print(f"👂 Listening for job alerts on http://{HOST}:{PORT}/alert")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import os
+import re
+import time
+import urllib.request
+from pathlib import Path
+
+import job_store
+import metrics
+from ndjson_sink import NdjsonSink
+
+# What to alert on; see alert_criteria.example.json
+CRITERIA_PATH = Path(os.environ.get("UPWORK_ALERT_CRITERIA", str(Path(__file__).parent / "alert_criteria.json")))
+WEBHOOK_URL = os.environ.get("UPWORK_ALERT_WEBHOOK", "http://127.0.0.1:8765/alert")
+DEFAULT_MAX_PER_HOUR = 10
+# How often server.py reloads the feed to look for new matches (0 = only on tool calls)
+POLL_SECONDS = float(os.environ.get("UPWORK_ALERT_POLL_SECONDS", "120"))
+# An alert no sink accepted is retried on later dispatches, this often and this many times
+RETRY_SECONDS = 60
+MAX_ATTEMPTS = 5
+
+ALERT_FIELDS = ("jobId", "title", "budget", "clientCountry", "proposals", "posted", "url")
+
+# delivered_at stays NULL until a sink accepts the alert; payload holds what a retry needs
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts_sent (
+    job_id TEXT NOT NULL,
+    criteria TEXT NOT NULL,
+    sent_at REAL NOT NULL,
+    delivered_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_attempt REAL,
+    payload TEXT,
+    PRIMARY KEY (job_id, criteria)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_alerts_sent_criteria ON alerts_sent(criteria, sent_at);
+"""
+
+_criteria_cache = (None, [])
+_file_sink = None
+
+
+def load_criteria():
+    """Alert criteria from CRITERIA_PATH, re-read whenever the file changes"""
+    global _criteria_cache
+
+    if not CRITERIA_PATH.exists():
+        return []
+    mtime = CRITERIA_PATH.stat().st_mtime
+    if _criteria_cache[0] != mtime:
+        with open(CRITERIA_PATH, encoding="utf-8") as f:
+            _criteria_cache = (mtime, json.load(f))
+    return _criteria_cache[1]
+
+
+def matches(job, criteria):
+    """True when a scraped job meets every condition in one criteria entry"""
+    text = " ".join(str(job.get(k) or "") for k in ("title", "description", "skills")).lower()
+    keywords = criteria.get("keywords") or []
+    if keywords and not any(re.search(r"\b" + re.escape(k.lower()), text) for k in keywords):
+        return False
+    if any(re.search(r"\b" + re.escape(k.lower()), text) for k in criteria.get("excludeKeywords") or []):
+        return False
+
+    countries = {job_store.normalize_country(c) for c in criteria.get("countries") or []}
+    if countries and job_store.normalize_country(job.get("clientCountry")) not in countries:
+        return False
+
+    budget_type, _, budget_max = job_store.parse_budget(job.get("budget"))
+    if criteria.get("budgetType") and budget_type not in (None, criteria["budgetType"]):
+        return False
+    # A tile without a budget passes; only a stated budget below the minimum is rejected
+    if criteria.get("minBudget") and budget_max is not None and budget_max < criteria["minBudget"]:
+        return False
+
+    low, _ = job_store.parse_proposals(job.get("proposals"))
+    if criteria.get("maxProposals") is not None and low is not None and low > criteria["maxProposals"]:
+        return False
+    return True
+
+
+def claim_alerts(jobs, new_ids, now=None, discovered_at=None):
+    """Match new jobs against every criteria entry and claim the alerts to send.
+
+    A (job, criteria) pair is only ever claimed once, across processes, and
+    each criteria entry is capped at maxPerHour alerts. Claimed alerts stay
+    pending until mark_delivered records a successful delivery.
+    """
+    criteria_list = load_criteria()
+    new_ids = set(new_ids)
+    if not criteria_list or not new_ids:
+        return []
+
+    conn = job_store.get_connection()
+    now = now if now is not None else time.time()
+    discovered_at = discovered_at if discovered_at is not None else now
+
+    claimed = []
+    with conn:
+        for criteria in criteria_list:
+            name = criteria.get("name", "default")
+            cap = criteria.get("maxPerHour", DEFAULT_MAX_PER_HOUR)
+            sent = conn.execute(
+                "SELECT COUNT(*) FROM alerts_sent WHERE criteria = ? AND sent_at >= ?",
+                (name, now - 3600),
+            ).fetchone()[0]
+
+            for job in jobs:
+                if sent >= cap:
+                    print(f"🔕 Alert cap of {cap}/hour reached for '{name}'")
+                    break
+                if job.get("jobId") not in new_ids or not matches(job, criteria):
+                    continue
+                payload = {"job": {k: job.get(k) for k in ALERT_FIELDS}, "discoveredAt": discovered_at}
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO alerts_sent (job_id, criteria, sent_at, last_attempt, payload) VALUES (?, ?, ?, ?, ?)",
+                    (job["jobId"], name, now, now, json.dumps(payload)),
+                ).rowcount
+                if inserted:
+                    claimed.append((criteria, job, discovered_at))
+                    sent += 1
+    return claimed
+
+
+def claim_retries(now=None):
+    """Claim pending alerts whose last delivery attempt failed, for another try"""
+    criteria_by_name = {c.get("name", "default"): c for c in load_criteria()}
+    if not criteria_by_name:
+        return []
+
+    conn = job_store.get_connection()
+    now = now if now is not None else time.time()
+
+    claimed = []
+    with conn:
+        rows = conn.execute("""
+            SELECT job_id, criteria, payload FROM alerts_sent
+            WHERE delivered_at IS NULL AND payload IS NOT NULL AND attempts < ? AND last_attempt < ?
+        """, (MAX_ATTEMPTS, now - RETRY_SECONDS)).fetchall()
+        for r in rows:
+            criteria = criteria_by_name.get(r["criteria"])
+            if criteria is None:
+                continue
+            # The guard on last_attempt keeps two processes from retrying the same alert
+            updated = conn.execute(
+                "UPDATE alerts_sent SET last_attempt = ? WHERE job_id = ? AND criteria = ? AND last_attempt < ?",
+                (now, r["job_id"], r["criteria"], now - RETRY_SECONDS),
+            ).rowcount
+            if updated:
+                payload = json.loads(r["payload"])
+                claimed.append((criteria, payload["job"], payload["discoveredAt"]))
+    return claimed
+
+
+def record_attempt(criteria, job, delivered_at):
+    """Count a delivery attempt; delivered_at is None when every sink failed"""
+    conn = job_store.get_connection()
+    with conn:
+        conn.execute(
+            "UPDATE alerts_sent SET attempts = attempts + 1, delivered_at = ? WHERE job_id = ? AND criteria = ?",
+            (delivered_at, job["jobId"], criteria.get("name", "default")),
+        )
+
+
+def _post_webhook(payload):
+    request = urllib.request.Request(
+        WEBHOOK_URL,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        response.read()
+
+
+def _notify_desktop(payload):
+    try:
+        from plyer import notification
+    except ImportError:
+        print("⚠️  Desktop alerts need 'pip install plyer'")
+        return
+    job = payload["job"]
+    notification.notify(
+        title=f"Upwork: {payload['criteria']}",
+        message=f"{job.get('title')}\n{job.get('budget') or ''}"[:250],
+        timeout=10,
+    )
+
+
+def _write_file(payload):
+    global _file_sink
+    if _file_sink is None:
+        _file_sink = NdjsonSink(prefix="alerts")
+    _file_sink.write_batch([payload])
+
+
+SINKS = {
+    "webhook": _post_webhook,
+    "desktop": _notify_desktop,
+    "file": _write_file,
+}
+
+
+def deliver(criteria, job, discovered_at):
+    """Send one alert to each of the criteria's sinks. Blocking; run it in a thread.
+
+    Returns the delivery time, or None when no sink accepted it.
+    """
+    payload = {
+        "criteria": criteria.get("name", "default"),
+        "job": {k: job.get(k) for k in ALERT_FIELDS},
+        "discoveredAt": discovered_at,
+        "alertedAt": time.time(),
+    }
+    delivered = False
+    for sink in criteria.get("sinks") or ["file"]:
+        try:
+            SINKS[sink](payload)
+            delivered = True
+        except Exception as e:
+            print(f"⚠️  Alert to {sink} failed for {job.get('jobId')}: {e}")
+    return time.time() if delivered else None
+
+
+async def dispatch(jobs, new_ids, discovered_at=None):
+    """Alert on newly seen jobs that match any criteria. Returns the number of alerts sent."""
+    discovered_at = discovered_at if discovered_at is not None else time.time()
+    # Alerts that failed earlier go out again alongside the new ones
+    claimed = claim_alerts(jobs, new_ids, discovered_at=discovered_at) + claim_retries()
+    if not claimed:
+        return 0
+
+    delivered = await asyncio.gather(*(
+        asyncio.to_thread(deliver, criteria, job, job_discovered_at)
+        for criteria, job, job_discovered_at in claimed
+    ))
+    sent = 0
+    for (criteria, job, job_discovered_at), delivered_at in zip(claimed, delivered):
+        record_attempt(criteria, job, delivered_at)
+        if delivered_at is None:
+            continue
+        sent += 1
+        metrics.record_metric(
+            "alert_latency", delivered_at - job_discovered_at,
+            jobId=job["jobId"], criteria=criteria.get("name", "default"),
+        )
+    if sent:
+        print(f"🔔 Sent {sent} job alerts")
+    if sent < len(claimed):
+        print(f"⚠️  {len(claimed) - sent} job alerts could not be delivered; they will be retried")
+    return sent
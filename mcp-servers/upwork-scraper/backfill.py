@@ -0,0 +1,122 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import client_cache
+import extractor
+import job_store
+import rollups
+import snapshots
+
+PROGRESS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backfill_progress (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    extractor_version INTEGER NOT NULL
+)
+"""
+
+
+def parse_snapshot(path):
+    """Worker: parse one archived page. Runs in a child process."""
+    html = snapshots.read_snapshot(path)
+    mtime = os.path.getmtime(path)
+
+    if extractor.is_detail_page(html):
+        jobs = [extractor.parse_job_detail(html, job_id=snapshots.job_id_from_path(path))]
+        detail = True
+    else:
+        jobs = extractor.parse_job_tiles(html)
+        detail = False
+
+    for job in jobs:
+        job["scrapedAt"] = mtime
+    return str(path), mtime, detail, jobs
+
+
+def pending_snapshots(conn, force=False):
+    """Snapshots not yet parsed by the current extractor version"""
+    done = {}
+    if not force:
+        done = {
+            r["path"]: (r["mtime"], r["extractor_version"])
+            for r in conn.execute("SELECT * FROM backfill_progress")
+        }
+
+    pending = []
+    for path in snapshots.iter_snapshots():
+        if done.get(str(path)) != (os.path.getmtime(path), extractor.EXTRACTOR_VERSION):
+            pending.append(str(path))
+    return pending
+
+
+def _flush(conn, details, tiles, progress):
+    """Write one batch of parsed results plus the snapshots they came from"""
+    if tiles:
+        job_store.save_jobs(tiles)
+    if details:
+        job_store.upsert_details(details)
+        client_cache.remember_clients(details)
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO backfill_progress (path, mtime, extractor_version) VALUES (?, ?, ?)",
+            [(path, mtime, extractor.EXTRACTOR_VERSION) for path, mtime in progress],
+        )
+
+
+def run_backfill(workers=None, batch_size=200, force=False):
+    """Re-parse every archived snapshot across a process pool and upsert the results"""
+    conn = job_store.get_connection()
+    conn.execute(PROGRESS_SCHEMA)
+
+    pending = pending_snapshots(conn, force)
+    if not pending:
+        print("✅ Nothing to backfill, every snapshot is up to date")
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    # Several chunks per worker keeps every core busy until the end
+    chunksize = max(1, min(64, len(pending) // (workers * 4)))
+    print(f"🔄 Re-parsing {len(pending)} snapshots on {workers} processes...")
+
+    started = time.time()
+    details, tiles, progress = [], [], []
+    done = 0
+
+    # Children only parse; this process is the single SQLite writer
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, mtime, detail, jobs in pool.map(parse_snapshot, pending, chunksize=chunksize):
+            (details if detail else tiles).extend(jobs)
+            progress.append((path, mtime))
+            done += 1
+
+            if len(progress) >= batch_size:
+                _flush(conn, details, tiles, progress)
+                details, tiles, progress = [], [], []
+                print(f"  {done}/{len(pending)} snapshots")
+
+    if progress:
+        _flush(conn, details, tiles, progress)
+
+    elapsed = time.time() - started
+    print(f"✅ Backfilled {done} snapshots in {elapsed:.1f}s ({done / max(elapsed, 1e-9):.0f}/s)")
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract job fields from archived HTML snapshots")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Snapshots per database write")
+    parser.add_argument("--force", action="store_true", help="Re-parse snapshots that are already up to date")
+    parser.add_argument("--rebuild-rollups", action="store_true", help="Recompute analytics rollups afterwards")
+    args = parser.parse_args()
+
+    run_backfill(args.workers, args.batch_size, args.force)
+    if args.rebuild_rollups:
+        rollups.rebuild()
+        print("📊 Rollups rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 import asyncio
 from playwright.async_api import async_playwright
-import json
+import alerts
+import job_store
+import rate_limiter
+from ndjson_sink import NdjsonSink
+import snapshots
 
 async def connect_to_chrome():
     """Connect to your manually-opened Chrome"""
@@ -30,7 +34,7 @@ async def connect_to_chrome():
             # Navigate to job feed if not there
             if "find-work" not in page.url:
                 print("🔄 Navigating to job feed...")
-                await page.goto("https://www.upwork.com/nx/find-work/best-matches")
+                await rate_limiter.polite_goto(page, "https://www.upwork.com/nx/find-work/best-matches")
                 await asyncio.sleep(3)
             
             print("🔍 Scraping jobs...")
@@ -101,10 +105,15 @@ async def connect_to_chrome():
             
             print(f"\n✅ Found {len(jobs)} jobs!")
             
+            # Archive the raw feed so fields can be re-extracted later (see backfill.py)
+            snapshots.save_snapshot(await page.content(), kind="feed")
+            
             if len(jobs) > 0:
-                # Save to file
-                with open('scraped_jobs.json', 'w', encoding='utf-8') as f:
-                    json.dump(jobs, f, indent=2)
+                # Append to the NDJSON output (rotated and compressed automatically)
+                sink = NdjsonSink()
+                sink.write_batch(jobs)
+                new_ids = job_store.save_jobs(jobs)
+                await alerts.dispatch(jobs, new_ids)
                 
                 # Display first 5 jobs
                 for i, job in enumerate(jobs[:5], 1):
@@ -123,7 +132,8 @@ async def connect_to_chrome():
                 if len(jobs) > 5:
                     print(f"\n... and {len(jobs) - 5} more jobs")
                 
-                print(f"\n💾 All {len(jobs)} jobs saved to scraped_jobs.json")
+                print(f"\n💾 All {len(jobs)} jobs appended to {sink.active_path}")
+                print(f"🗄️  {len(new_ids)} new jobs added to {job_store.DB_PATH}")
             else:
                 print("⚠️  No jobs found. Make sure you're on the job feed page.")
                 
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+import extractor
+import job_store
+
+# Client data changes slowly (spend, hires, rating); re-parse it after this long
+CLIENT_TTL = float(os.environ.get("UPWORK_CLIENT_TTL_HOURS", "24")) * 3600
+
+# Fields from the about-client block that belong to the client, not the job.
+# Local time is left out since it is stale as soon as it is stored.
+CLIENT_FIELDS = (
+    "clientPaymentVerified", "clientPhoneVerified", "clientRating", "clientReviews",
+    "clientCountry", "clientCity", "clientJobsPosted", "clientHireRate",
+    "clientSpent", "clientHires", "clientMemberSince",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    client_key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS job_clients (
+    job_id TEXT PRIMARY KEY,
+    client_key TEXT NOT NULL
+);
+"""
+
+# Upwork does not expose a client id on the detail page, so the client is
+# identified by where they are and when they joined, read straight from the raw HTML.
+_LOCATION_RE = re.compile(
+    r'data-qa="client-location"[^>]*>\s*<strong[^>]*>([^<]*)</strong>'
+    r'(?:\s*<div[^>]*>\s*<span[^>]*>([^<]*)</span>)?'
+)
+_MEMBER_SINCE_RE = re.compile(r'data-qa="client-contract-date"[^>]*>\s*<small[^>]*>\s*Member since\s*([^<]*)<')
+
+
+def client_key(country, city, member_since):
+    """Client identifier, or None when the page does not say enough to tell clients apart.
+
+    Upwork's markup carries no buyer id, so this is country + city + member-since
+    date: two clients in the same city who joined on the same day share an entry.
+    """
+    if not member_since:
+        return None
+    parts = (job_store.normalize_country(country), city, member_since)
+    raw = "|".join(" ".join((p or "").lower().split()) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def client_key_from_html(html):
+    """Client identifier from a detail page, without building the DOM"""
+    location = _LOCATION_RE.search(html)
+    since = _MEMBER_SINCE_RE.search(html)
+    if location is None or since is None:
+        return None
+    return client_key(location.group(1).strip(), (location.group(2) or "").strip(), since.group(1).strip())
+
+
+def client_key_of(record):
+    """Client identifier from an already parsed detail record"""
+    return client_key(record.get("clientCountry"), record.get("clientCity"), record.get("clientMemberSince"))
+
+
+def get_client(key, max_age=CLIENT_TTL):
+    """Cached client fields, or None if unknown or older than max_age seconds"""
+    if key is None:
+        return None
+    conn = job_store.get_connection()
+    row = conn.execute("SELECT data, fetched_at FROM clients WHERE client_key = ?", (key,)).fetchone()
+    if row is None or (max_age is not None and time.time() - row["fetched_at"] > max_age):
+        return None
+    return json.loads(row["data"])
+
+
+def remember_clients(records, fetched_at=None):
+    """Cache the client block of parsed detail records and link each job to its client"""
+    conn = job_store.get_connection()
+    now = fetched_at if fetched_at is not None else time.time()
+
+    clients, links = {}, []
+    for record in records:
+        key = client_key_of(record)
+        if key is None:
+            continue
+        at = record.get("scrapedAt") or now
+        if key not in clients or clients[key][1] < at:
+            clients[key] = ({f: record.get(f) for f in CLIENT_FIELDS}, at)
+        if record.get("jobId"):
+            links.append((record["jobId"], key))
+
+    with conn:
+        conn.executemany("""
+            INSERT INTO clients (client_key, data, fetched_at) VALUES (?, ?, ?)
+            ON CONFLICT(client_key) DO UPDATE SET data = excluded.data, fetched_at = excluded.fetched_at
+            WHERE excluded.fetched_at >= clients.fetched_at
+        """, [(key, json.dumps(data), at) for key, (data, at) in clients.items()])
+        conn.executemany("INSERT OR REPLACE INTO job_clients (job_id, client_key) VALUES (?, ?)", links)
+    return len(clients)
+
+
+def parse_detail(html, job_id=None, url=None):
+    """Parse a detail page, taking the client block from the cache while it is fresh"""
+    key = client_key_from_html(html)
+    cached = get_client(key)
+
+    job = extractor.parse_job_detail(html, job_id=job_id, url=url, include_client=cached is None)
+    if cached is None:
+        remember_clients([job])
+    else:
+        job.update(cached)
+        if job.get("jobId"):
+            conn = job_store.get_connection()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO job_clients (job_id, client_key) VALUES (?, ?)", (job["jobId"], key))
+    return job
+
+
+def annotate_tiles(jobs):
+    """Attach cached client data to feed tiles in place, without loading any page.
+
+    Only tiles whose detail page was parsed before are annotated; a tile alone
+    does not show enough to tell which client posted it.
+    """
+    conn = job_store.get_connection()
+
+    ids = [job["jobId"] for job in jobs if job.get("jobId")]
+    linked = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        linked.update(
+            (r["job_id"], r["client_key"])
+            for r in conn.execute(
+                f"SELECT job_id, client_key FROM job_clients WHERE job_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+        )
+
+    annotated = 0
+    for job in jobs:
+        key = linked.get(job.get("jobId"))
+        row = key and conn.execute("SELECT data, fetched_at FROM clients WHERE client_key = ?", (key,)).fetchone()
+        if row:
+            job["client"] = json.loads(row["data"])
+            job["client"]["cachedAt"] = time.strftime("%Y-%m-%d %H:%M", time.gmtime(row["fetched_at"]))
+            annotated += 1
+    return annotated
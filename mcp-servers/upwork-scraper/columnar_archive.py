@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import job_store
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only the archive needs it
+    np = None
+
+# One directory per posting day, one .npy file per column
+ARCHIVE_DIR = Path(os.environ.get("UPWORK_ARCHIVE_DIR", str(Path(__file__).parent / "archive")))
+ARCHIVE_VERSION = 1
+
+BUDGET_TYPES = (None, "hourly", "fixed")
+
+# Column -> NumPy dtype. Strings that repeat (countries, skills) are stored as
+# int32 codes into append-only dictionaries shared by every partition.
+COLUMNS = {
+    "job_id": "S24",
+    "posted_at": "f8",
+    "first_seen": "f8",
+    "budget_type": "i1",
+    "budget_min": "f4",
+    "budget_max": "f4",
+    "proposals": "i2",
+    "country": "i4",
+    "skills_offsets": "i8",
+    "skills": "i4",
+}
+DICTIONARY_COLUMNS = ("country", "skills")
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("The columnar archive needs NumPy: pip install numpy")
+
+
+class Dictionary:
+    """Append-only string <-> code table for one dictionary-encoded column"""
+
+    def __init__(self, name, directory=None):
+        self.path = Path(directory or ARCHIVE_DIR) / "dictionaries" / f"{name}.json"
+        self.values = json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else []
+        self.codes = {value: code for code, value in enumerate(self.values)}
+        self._dirty = False
+
+    def encode(self, value):
+        """Code for a value, adding it if new. None is -1."""
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            self._dirty = True
+        return code
+
+    def decode(self, code):
+        return self.values[code] if code >= 0 else None
+
+    def save(self):
+        if self._dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self.values, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+def _partition(day, directory=None):
+    return Path(directory or ARCHIVE_DIR) / f"day={day}"
+
+
+def _read_meta(path):
+    meta_path = path / "_meta.json"
+    return json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else None
+
+
+def _days_to_export(conn, directory, rebuild):
+    """Posting days whose jobs changed after their partition was written"""
+    days = []
+    for r in conn.execute("""
+        SELECT date(posted_at, 'unixepoch') AS day, MAX(last_seen) AS changed
+        FROM jobs GROUP BY day ORDER BY day
+    """):
+        meta = _read_meta(_partition(r["day"], directory))
+        if rebuild or meta is None or meta["version"] != ARCHIVE_VERSION or meta["exportedAt"] < r["changed"]:
+            days.append(r["day"])
+    return days
+
+
+def _write_partition(day, rows, dictionaries, directory):
+    n = len(rows)
+    columns = {name: np.empty(n, dtype=dtype) for name, dtype in COLUMNS.items() if name not in ("skills", "skills_offsets")}
+    offsets = np.zeros(n + 1, dtype=COLUMNS["skills_offsets"])
+    skill_codes = []
+
+    for i, r in enumerate(rows):
+        columns["job_id"][i] = r["job_id"].encode("ascii", "replace")
+        columns["posted_at"][i] = r["posted_at"]
+        columns["first_seen"][i] = r["first_seen"]
+        columns["budget_type"][i] = BUDGET_TYPES.index(r["budget_type"]) if r["budget_type"] in BUDGET_TYPES else 0
+        columns["budget_min"][i] = r["budget_min"] if r["budget_min"] is not None else np.nan
+        columns["budget_max"][i] = r["budget_max"] if r["budget_max"] is not None else np.nan
+        low, _ = job_store.parse_proposals(r["proposals"])
+        columns["proposals"][i] = low if low is not None else -1
+        columns["country"][i] = dictionaries["country"].encode(r["client_country"])
+        for skill in (r["skills"] or "").split(","):
+            if skill.strip():
+                skill_codes.append(dictionaries["skills"].encode(skill.strip()))
+        offsets[i + 1] = len(skill_codes)
+
+    columns["skills_offsets"] = offsets
+    columns["skills"] = np.asarray(skill_codes, dtype=COLUMNS["skills"])
+
+    # Build the partition beside the old one and swap it in whole
+    path = _partition(day, directory)
+    tmp_path = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+    for name, array in columns.items():
+        np.save(tmp_path / f"{name}.npy", array)
+    (tmp_path / "_meta.json").write_text(
+        json.dumps({"version": ARCHIVE_VERSION, "rows": n, "exportedAt": time.time()}), encoding="utf-8"
+    )
+    # Dictionaries are saved before the partition that references their new codes appears
+    for dictionary in dictionaries.values():
+        dictionary.save()
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+
+def export_archive(directory=None, rebuild=False):
+    """Write every changed posting day from the job store into the archive. Returns days written."""
+    _require_numpy()
+    directory = Path(directory or ARCHIVE_DIR)
+    conn = job_store.get_connection()
+    dictionaries = {name: Dictionary(name, directory) for name in DICTIONARY_COLUMNS}
+
+    days = _days_to_export(conn, directory, rebuild)
+    for day in days:
+        rows = conn.execute("""
+            SELECT job_id, posted_at, first_seen, budget_type, budget_min, budget_max,
+                   proposals, client_country, skills
+            FROM jobs
+            WHERE posted_at >= strftime('%s', ?) AND posted_at < strftime('%s', ?, '+1 day')
+            ORDER BY posted_at
+        """, (day, day)).fetchall()
+        _write_partition(day, rows, dictionaries, directory)
+    return days
+
+
+def partitions(start_day=None, end_day=None, directory=None):
+    """Archived days in order, optionally limited to start_day..end_day (inclusive)"""
+    root = Path(directory or ARCHIVE_DIR)
+    if not root.exists():
+        return []
+    days = sorted(p.name[4:] for p in root.glob("day=*") if p.is_dir() and not p.name.endswith(".tmp"))
+    return [d for d in days if (start_day is None or d >= start_day) and (end_day is None or d <= end_day)]
+
+
+def iter_partitions(columns, start_day=None, end_day=None, directory=None):
+    """Yield (day, {column: array}) with every array memory-mapped, so nothing is copied or parsed"""
+    _require_numpy()
+    for day in partitions(start_day, end_day, directory):
+        path = _partition(day, directory)
+        yield day, {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in columns}
+
+
+def load(columns, start_day=None, end_day=None, directory=None):
+    """Columns over a day range as single arrays (one copy when several days are joined).
+
+    Asking for 'skills' also returns 'skills_offsets', rebased to the joined array.
+    """
+    _require_numpy()
+    columns = list(columns)
+    if "skills" in columns and "skills_offsets" not in columns:
+        columns.append("skills_offsets")
+
+    parts = list(iter_partitions(columns, start_day, end_day, directory))
+    if len(parts) == 1:
+        return parts[0][1]
+
+    result = {}
+    for name in columns:
+        if name == "skills_offsets":
+            pieces, base = [np.zeros(1, dtype=COLUMNS[name])], 0
+            for _, arrays in parts:
+                pieces.append(arrays[name][1:] + base)
+                base += int(arrays[name][-1])
+            result[name] = np.concatenate(pieces)
+        else:
+            arrays = [arrays[name] for _, arrays in parts]
+            result[name] = np.concatenate(arrays) if arrays else np.empty(0, dtype=COLUMNS[name])
+    return result
+
+
+def summary(start_day=None, end_day=None, directory=None, top=10):
+    """Example full scan: job count, hourly budget quantiles, top countries and skills"""
+    data = load(["budget_type", "budget_max", "country", "skills"], start_day, end_day, directory)
+    countries = Dictionary("country", directory)
+    skills = Dictionary("skills", directory)
+
+    hourly = data["budget_max"][(data["budget_type"] == BUDGET_TYPES.index("hourly")) & ~np.isnan(data["budget_max"])]
+    country_counts = np.bincount(data["country"][data["country"] >= 0], minlength=len(countries.values))
+    skill_counts = np.bincount(data["skills"], minlength=len(skills.values))
+
+    return {
+        "jobs": int(len(data["budget_type"])),
+        "hourlyJobs": int(len(hourly)),
+        "medianHourlyBudget": float(np.median(hourly)) if len(hourly) else None,
+        "p90HourlyBudget": float(np.quantile(hourly, 0.9)) if len(hourly) else None,
+        "topCountries": [(countries.decode(int(c)), int(country_counts[c])) for c in np.argsort(-country_counts)[:top] if country_counts[c]],
+        "topSkills": [(skills.decode(int(c)), int(skill_counts[c])) for c in np.argsort(-skill_counts)[:top] if skill_counts[c]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar archive of the job history")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export", help="Write changed posting days from the job store")
+    export_parser.add_argument("--rebuild", action="store_true", help="Rewrite every day")
+    summary_parser = sub.add_parser("summary", help="Scan the archive and print headline numbers")
+    summary_parser.add_argument("--start", help="First day, YYYY-MM-DD")
+    summary_parser.add_argument("--end", help="Last day, YYYY-MM-DD")
+    args = parser.parse_args()
+
+    started = time.time()
+    if args.command == "export":
+        days = export_archive(rebuild=args.rebuild)
+        print(f"📦 Archived {len(days)} days in {time.time() - started:.1f}s")
+    else:
+        print(json.dumps(summary(args.start, args.end), indent=2))
+        print(f"⏱️  Scanned in {time.time() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import re
+import time
+
+import job_store
+
+# Fields tracked over a job's life. Proposals are stored as the low end of
+# Upwork's bucket ("10 to 15" -> 10) so every value is a small integer.
+TRACKED_FIELDS = ("proposals", "interviewing", "invitesSent", "unansweredInvites", "connects")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_activity_state (
+    job_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (job_id, field)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS job_activity_deltas (
+    job_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    at INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (job_id, field, at)
+) WITHOUT ROWID;
+"""
+
+
+def _as_int(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.search(r"\d+", str(value))
+    return int(match.group(0)) if match else None
+
+
+def observed_values(job):
+    """Tracked field values present on a scraped tile or detail record"""
+    activity = job.get("activity") or {}
+    values = {}
+
+    low, _ = job_store.parse_proposals(job.get("proposals") or activity.get("proposals"))
+    if low is not None:
+        values["proposals"] = low
+    for field in ("interviewing", "invitesSent", "unansweredInvites"):
+        value = _as_int(activity.get(field))
+        if value is not None:
+            values[field] = value
+    connects = _as_int(job.get("connects"))
+    if connects is not None:
+        values["connects"] = connects
+    return values
+
+
+def record_observations(conn, jobs, seen_at=None):
+    """Record a sighting of each job, storing a delta row only when a value changed.
+
+    A sighting older than the stored state (a backfilled snapshot) only adds
+    history; the current value stays as the newest sighting left it.
+    """
+    now = seen_at if seen_at is not None else time.time()
+
+    observations = {}
+    for job in jobs:
+        job_id = job_store.clean(job.get("jobId"))
+        if job_id:
+            for field, value in observed_values(job).items():
+                observations[(job_id, field)] = (value, job.get("scrapedAt") or now)
+    if not observations:
+        return 0
+
+    current = {}
+    job_ids = sorted({job_id for job_id, _ in observations})
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        for r in conn.execute(
+            f"SELECT job_id, field, value, last_seen FROM job_activity_state WHERE job_id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ):
+            current[(r["job_id"], r["field"])] = (r["value"], r["last_seen"])
+
+    deltas = []
+    states = []
+    for (job_id, field), (value, at) in observations.items():
+        state = current.get((job_id, field))
+        if state is None or at >= state[1]:
+            if state is None or state[0] != value:
+                deltas.append((job_id, field, int(at), value))
+            states.append((job_id, field, value, at, at))
+            continue
+
+        # Out of order: compare with the value that held at that time, not the current one
+        previous = conn.execute(
+            "SELECT value FROM job_activity_deltas WHERE job_id = ? AND field = ? AND at <= ? ORDER BY at DESC LIMIT 1",
+            (job_id, field, int(at)),
+        ).fetchone()
+        if previous is None or previous["value"] != value:
+            deltas.append((job_id, field, int(at), value))
+            later = conn.execute(
+                "SELECT 1 FROM job_activity_deltas WHERE job_id = ? AND field = ? AND at > ? LIMIT 1",
+                (job_id, field, int(at)),
+            ).fetchone()
+            # Keep the history ending on the current value
+            if later is None and state[0] != value:
+                deltas.append((job_id, field, int(state[1]), state[0]))
+
+    conn.executemany(
+        "INSERT OR REPLACE INTO job_activity_deltas (job_id, field, at, value) VALUES (?, ?, ?, ?)",
+        deltas,
+    )
+    conn.executemany("""
+        INSERT INTO job_activity_state (job_id, field, value, first_seen, last_seen)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(job_id, field) DO UPDATE SET
+            value = excluded.value,
+            last_seen = excluded.last_seen
+        WHERE excluded.last_seen >= job_activity_state.last_seen
+    """, states)
+    return len(deltas)
+
+
+def fill_rate(job_id):
+    """How fast a job is collecting proposals, from its recorded history"""
+    conn = job_store.get_connection()
+
+    job = conn.execute("SELECT posted_at, first_seen FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+    history = conn.execute(
+        "SELECT field, at, value FROM job_activity_deltas WHERE job_id = ? ORDER BY at",
+        (job_id,),
+    ).fetchall()
+    state = {
+        r["field"]: r
+        for r in conn.execute("SELECT * FROM job_activity_state WHERE job_id = ?", (job_id,))
+    }
+    if job is None and not state:
+        return None
+
+    result = {"jobId": job_id}
+    for field in TRACKED_FIELDS:
+        if field in state:
+            result[field] = state[field]["value"]
+    result["history"] = {}
+    for r in history:
+        result["history"].setdefault(r["field"], []).append(
+            {"at": time.strftime("%Y-%m-%d %H:%M", time.gmtime(r["at"])), "value": r["value"]}
+        )
+
+    proposals = state.get("proposals")
+    if proposals is not None:
+        posted_at = (job["posted_at"] or job["first_seen"]) if job else proposals["first_seen"]
+        hours_live = max((proposals["last_seen"] - posted_at) / 3600, 0.25)
+        result["hoursSincePosted"] = round(hours_live, 1)
+        result["proposalsPerHour"] = round(proposals["value"] / hours_live, 2)
+
+        # Rate over our own observations, when the value has moved since first sighting
+        points = [r for r in history if r["field"] == "proposals"]
+        if len(points) > 1:
+            observed_hours = max((proposals["last_seen"] - points[0]["at"]) / 3600, 0.25)
+            result["observedProposalsPerHour"] = round(
+                (points[-1]["value"] - points[0]["value"]) / observed_hours, 2
+            )
+    return result
+
+
+def uncrowded_jobs(max_proposals=10, max_age_hours=48, limit=20):
+    """Recent jobs with the fewest proposals per hour live, least crowded first"""
+    conn = job_store.get_connection()
+
+    now = time.time()
+    rows = conn.execute("""
+        SELECT j.job_id, j.title, j.url, s.value AS proposals,
+               MAX((s.last_seen - COALESCE(j.posted_at, j.first_seen)) / 3600.0, 0.25) AS hours_live
+        FROM job_activity_state s
+        JOIN jobs j ON j.job_id = s.job_id
+        WHERE s.field = 'proposals'
+          AND s.value <= ?
+          AND COALESCE(j.posted_at, j.first_seen) >= ?
+        ORDER BY s.value / hours_live, s.value
+        LIMIT ?
+    """, (int(max_proposals), now - max_age_hours * 3600, int(limit))).fetchall()
+
+    return [{
+        "jobId": r["job_id"],
+        "title": r["title"],
+        "proposals": r["proposals"],
+        "hoursSincePosted": round(r["hours_live"], 1),
+        "proposalsPerHour": round(r["proposals"] / r["hours_live"], 2),
+        "url": r["url"],
+    } for r in rows]
@@ -1,6 +1,8 @@
 import asyncio
 from playwright.async_api import async_playwright
 import json
+import re
+import snapshots
 
 async def debug_job_details():
     """Debug script to explore job detail page structure"""
@@ -47,6 +49,11 @@ async def debug_job_details():
                 f.write(html)
             print("📄 HTML saved to job_detail_page.html")
             
+            # Also archive it for backfill.py, keyed by jobId
+            job_id_match = re.search(r"(~0\d+)", current_url)
+            if job_id_match:
+                snapshots.save_snapshot(html, job_id=job_id_match.group(1))
+            
             # Extract all data-test attributes
             print("\n" + "="*70)
             print("📋 ALL data-test ATTRIBUTES ON THIS PAGE")
@@ -58,7 +65,8 @@ async def debug_job_details():
                     const tests = [];
                     elements.forEach(el => {
                         const attr = el.getAttribute('data-test');
-                        const text = el.innerText ? el.innerText.trim().substring(0, 60) : '';
+                        // textContent reads the DOM without forcing a layout like innerText does
+                        const text = el.textContent.replace(/\s+/g, ' ').trim().substring(0, 60);
                         tests.push({
                             attr: attr,
                             text: text,
@@ -157,7 +165,7 @@ async def debug_job_details():
                                 const samples = [];
                                 elements.forEach((el, idx) => {
                                     if (idx < 3) {  // First 3 examples
-                                        const text = el.innerText || el.textContent || '';
+                                        const text = (el.textContent || '').replace(/\s+/g, ' ');
                                         if (text.trim()) {
                                             samples.push({
                                                 selector: selector,
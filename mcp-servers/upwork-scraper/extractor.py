@@ -0,0 +1,346 @@
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+# Bump whenever the extracted fields change so the backfill re-parses every snapshot
+EXTRACTOR_VERSION = 1
+
+# Job detail page fields (see 'parsing instructions.json')
+DETAIL_SELECTORS = {
+    "title": 'h4 span.flex-1',
+    "summary": '[data-test="Description"] p',
+    "deliverables": '[data-test="deliverable"]',
+    "features": 'ul.features li',
+    "projectType": 'ul.segmentations li',
+    "skills": '.skills-list a.badge',
+    "qualifications": 'ul.qualification-items li',
+    "activity": 'ul.client-activity-items li.ca-item',
+    "client": '[data-test="about-client-container"]',
+    "clientLocation": '[data-qa="client-location"]',
+    "clientJobs": '[data-qa="client-job-posting-stats"]',
+    "clientSpent": '[data-qa="client-spend"]',
+    "clientHires": '[data-qa="client-hires"]',
+    "clientMemberSince": '[data-qa="client-contract-date"]',
+    "clientRating": '[data-testid="buyer-rating"] .sr-only',
+}
+
+# Job feed tile fields, matching the selectors used by chrome_connect.py
+TILE_SELECTORS = {
+    "tile": 'section[data-ev-label="visible_job_tile_impression"]',
+    "title": 'h3.job-tile-title a',
+    "description": '[data-test="job-description-text"]',
+    "budget": '[data-test="job-type"]',
+    "experienceLevel": '[data-test="contractor-tier"]',
+    "duration": '[data-test="duration"]',
+    "posted": '[data-test="posted-on"]',
+    "clientSpent": '[data-test="client-spendings"]',
+    "clientCountry": '[data-test="client-country"]',
+    "clientPaymentVerified": '[data-test="payment-verification-status"]',
+    "proposals": '[data-test="proposals"]',
+}
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+# Scripts, styles and inline SVG icons make up most of an Upwork page and carry
+# nothing we extract, so they are dropped before parsing.
+_STRIP_RE = re.compile(r"<(script|style|svg)\b.*?</\1\s*>", re.S | re.I)
+
+_SELECTOR_PART_RE = re.compile(
+    r'([a-zA-Z][\w-]*)|\.([\w-]+)|\[([\w-]+)(?:([*^]?=)"([^"]*)")?\]'
+)
+
+
+class Node:
+    """Minimal DOM element: tag, attributes and children (Nodes or text)"""
+
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+
+    def text(self):
+        """Whitespace-normalized text content of this element"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return " ".join(" ".join(parts).split())
+
+    def iter(self):
+        """All descendant elements in document order"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Node):
+                yield node
+                stack.extend(reversed(node.children))
+
+    def select(self, selector):
+        """Elements matching a simple descendant selector such as 'ul.features li'"""
+        steps = [_parse_compound(part) for part in selector.split()]
+        matches = [self]
+        for step in steps:
+            found = []
+            seen = set()
+            for root in matches:
+                for node in root.iter():
+                    if id(node) not in seen and _matches(node, step):
+                        seen.add(id(node))
+                        found.append(node)
+            matches = found
+        return matches
+
+    def select_one(self, selector):
+        found = self.select(selector)
+        return found[0] if found else None
+
+
+def _parse_compound(part):
+    tag, classes, attrs = None, [], []
+    for name, cls, attr, op, value in _SELECTOR_PART_RE.findall(part):
+        if name:
+            tag = name.lower()
+        elif cls:
+            classes.append(cls)
+        else:
+            attrs.append((attr, op, value))
+    return tag, classes, attrs
+
+
+def _matches(node, step):
+    tag, classes, attrs = step
+    if tag and node.tag != tag:
+        return False
+    if classes:
+        node_classes = (node.attrs.get("class") or "").split()
+        if any(c not in node_classes for c in classes):
+            return False
+    for attr, op, value in attrs:
+        actual = node.attrs.get(attr)
+        if actual is None:
+            return False
+        if op == "=" and actual != value:
+            return False
+        if op == "*=" and value not in actual:
+            return False
+        if op == "^=" and not actual.startswith(value):
+            return False
+    return True
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        # Browsers tolerate unclosed tags; pop back to the matching open element
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def parse_html(html):
+    """Parse an HTML page into a Node tree"""
+    title = re.search(r"<title[^>]*>(.*?)</title>", html, re.S | re.I)
+    builder = _TreeBuilder()
+    builder.feed(_STRIP_RE.sub("", html))
+    builder.close()
+    builder.root.attrs["title"] = unescape(title.group(1)).strip() if title else ""
+    return builder.root
+
+
+def _text(node):
+    if node is None:
+        return None
+    return node.text() or None
+
+
+def _job_id(root, job_id):
+    if job_id:
+        return job_id
+    details = root.select_one("[data-ev-opening_uid]")
+    if details is not None:
+        return "~02" + details.attrs["data-ev-opening_uid"]
+    return None
+
+
+def _parse_features(root, job):
+    """Workload, duration, experience level and pay range from the features list"""
+    for li in root.select(DETAIL_SELECTORS["features"]):
+        # Job features carry an icon; the client stats list reuses the 'features' class without one
+        icon = li.select_one("[data-cy]")
+        if icon is None:
+            continue
+        kind = icon.attrs["data-cy"]
+        label = _text(li.select_one("div.description"))
+        values = [s.text() for s in li.select("strong")]
+
+        if kind == "expertise":
+            job["experienceLevel"] = values[0] if values else None
+        elif kind.startswith("duration"):
+            # Desktop and mobile variants of the duration are both in the markup
+            spans = li.select("strong span")
+            job["duration"] = spans[0].text() if spans else (values[0] if values else None)
+        elif kind == "clock-hourly":
+            job["workload"] = values[0] if values else None
+        elif kind in ("clock-timelog", "fixed-price") or (values and "$" in values[0]):
+            contract_type = label or ("Hourly" if kind == "clock-timelog" else "Fixed-price")
+            job["contractType"] = contract_type
+            job["budget"] = f"{contract_type}: " + "-".join(v for v in values if "$" in v)
+
+
+def _parse_activity(root):
+    activity = {}
+    for li in root.select(DETAIL_SELECTORS["activity"]):
+        title = _text(li.select_one("span.title"))
+        value = _text(li.select_one(".value"))
+        if title:
+            key = re.sub(r"[^a-z]+", " ", title.lower()).strip()
+            key = key.split()[0] + "".join(w.capitalize() for w in key.split()[1:])
+            activity[key] = value
+    return activity
+
+
+def _parse_client(root):
+    client = {}
+    container = root.select_one(DETAIL_SELECTORS["client"])
+    if container is None:
+        return client
+
+    container_text = container.text()
+    client["clientPaymentVerified"] = "Payment method verified" in container_text
+    client["clientPhoneVerified"] = "Phone number verified" in container_text
+
+    rating = _text(container.select_one('[data-testid="buyer-rating"] .sr-only'))
+    match = re.search(r"([\d.]+) out of", rating or "")
+    client["clientRating"] = float(match.group(1)) if match else None
+    reviews = re.search(r"of (\d+) reviews?", container_text)
+    client["clientReviews"] = int(reviews.group(1)) if reviews else None
+
+    location = container.select_one(DETAIL_SELECTORS["clientLocation"])
+    if location is not None:
+        spans = location.select("span.nowrap")
+        client["clientCountry"] = _text(location.select_one("strong"))
+        client["clientCity"] = spans[0].text() if spans else None
+        client["clientLocalTime"] = spans[1].text() if len(spans) > 1 else None
+
+    jobs = container.select_one(DETAIL_SELECTORS["clientJobs"])
+    if jobs is not None:
+        client["clientJobsPosted"] = _text(jobs.select_one("strong"))
+        client["clientHireRate"] = _text(jobs.select_one("div"))
+
+    spent = _text(container.select_one(DETAIL_SELECTORS["clientSpent"]))
+    client["clientSpent"] = spent.replace(" total spent", "") if spent else None
+    client["clientHires"] = _text(container.select_one(DETAIL_SELECTORS["clientHires"]))
+
+    since = _text(container.select_one(DETAIL_SELECTORS["clientMemberSince"]))
+    client["clientMemberSince"] = since.replace("Member since ", "") if since else None
+    return client
+
+
+def parse_job_detail(html, job_id=None, url=None, include_client=True):
+    """Extract every configured field from a saved job detail page.
+
+    include_client=False skips the about-client block, for callers that
+    already hold the client's data (see client_cache.py).
+    """
+    root = parse_html(html)
+    job_id = _job_id(root, job_id)
+
+    title = _text(root.select_one(DETAIL_SELECTORS["title"]))
+    if title is None and root.attrs["title"]:
+        title = root.attrs["title"].split(" - ")[0]
+
+    job = {
+        "jobId": job_id,
+        "title": title,
+        "description": _text(root.select_one(DETAIL_SELECTORS["summary"])),
+        "deliverables": [li.text() for li in root.select(DETAIL_SELECTORS["deliverables"])],
+        "skills": [],
+        "qualifications": [li.text() for li in root.select(DETAIL_SELECTORS["qualifications"])],
+        # Only a URL that was actually scraped; a made-up one would replace the real one in the store
+        "url": url,
+    }
+
+    # The same skill can be listed under both "Mandatory skills" and "Tools"
+    for badge in root.select(DETAIL_SELECTORS["skills"]):
+        skill = badge.text()
+        if skill and skill not in job["skills"]:
+            job["skills"].append(skill)
+
+    _parse_features(root, job)
+
+    project_type = _text(root.select_one(DETAIL_SELECTORS["projectType"]))
+    if project_type:
+        job["projectType"] = project_type.replace("Project Type:", "").strip()
+
+    posted = re.search(r"Posted\s+(.+?ago|yesterday)", root.text())
+    job["posted"] = posted.group(1) if posted else None
+
+    activity = _parse_activity(root)
+    job["activity"] = activity
+    job["proposals"] = activity.get("proposals")
+
+    connects = re.search(r"Send a proposal for:\s*(\d+)\s*Connects", root.text())
+    job["connects"] = int(connects.group(1)) if connects else None
+
+    if include_client:
+        job.update(_parse_client(root))
+    return job
+
+
+def parse_job_tiles(html):
+    """Extract job tiles from a saved job feed page"""
+    root = parse_html(html)
+    jobs = []
+
+    for tile in root.select(TILE_SELECTORS["tile"]):
+        link = tile.select_one(TILE_SELECTORS["title"])
+        if link is None:
+            continue
+        href = link.attrs.get("href", "")
+        url = href if href.startswith("http") else "https://www.upwork.com" + href
+        match = re.search(r"_(~0\d+)", url)
+
+        job = {
+            "jobId": match.group(1) if match else None,
+            "title": link.text(),
+            "url": url,
+        }
+        for field, selector in TILE_SELECTORS.items():
+            if field not in ("tile", "title"):
+                job[field] = _text(tile.select_one(selector))
+        jobs.append(job)
+
+    return jobs
+
+
+def is_detail_page(html):
+    """True for a job detail snapshot, False for a job feed snapshot"""
+    return 'data-test="about-client-container"' in html or 'jobdetails_impression' in html
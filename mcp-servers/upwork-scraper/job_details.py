@@ -0,0 +1,127 @@
+import asyncio
+import json
+import re
+import time
+
+import client_cache
+import job_store
+import rate_limiter
+import session
+import snapshots
+
+DETAIL_URL = "https://www.upwork.com/jobs/{job_id}"
+
+# Detail pages open at once for a batch; the rate limiter still paces the loads
+CONCURRENCY = 3
+
+
+def job_id_of(value):
+    """jobId from a jobId or any Upwork job URL"""
+    match = re.search(r"(~0[0-9a-f]+)", value or "")
+    return match.group(1) if match else None
+
+
+async def fetch_job_detail(context, job_id=None, url=None):
+    """Open a job's detail page in a new tab, archive it and store the parsed record"""
+    job_id = job_id or job_id_of(url)
+
+    detail_page = await context.new_page()
+    try:
+        await rate_limiter.polite_goto(detail_page, url or DETAIL_URL.format(job_id=job_id),
+                                       wait_until="domcontentloaded", timeout=30000)
+        if session.is_auth_redirect(detail_page.url):
+            raise session.LoginRequiredError()
+        await detail_page.wait_for_selector('[data-test="about-client-container"]', timeout=15000)
+        html = await detail_page.content()
+    finally:
+        await detail_page.close()
+
+    snapshots.save_snapshot(html, job_id=job_id)
+    job = client_cache.parse_detail(html, job_id=job_id, url=url)
+    job_store.upsert_details([job])
+    return job
+
+
+def cached_details(job_ids, max_age):
+    """Stored detail records younger than max_age seconds, by jobId"""
+    conn = job_store.get_connection()
+    cutoff = time.time() - max_age
+    found = {}
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        for r in conn.execute(
+            f"""SELECT job_id, details, details_fetched_at FROM jobs
+                WHERE details IS NOT NULL AND details_fetched_at >= ?
+                  AND job_id IN ({','.join('?' * len(chunk))})""",
+            [cutoff, *chunk],
+        ):
+            found[r["job_id"]] = json.loads(r["details"])
+    return found
+
+
+async def fetch_many(get_context, targets, max_age=24 * 3600, timeout=90, on_progress=None, known_urls=None):
+    """Details for a list of jobIds or URLs, fresh ones from the store and the rest fetched concurrently.
+
+    get_context() is awaited for the browser context only if something has to
+    be fetched. on_progress(done, total) is awaited after each job completes. Jobs still
+    loading when timeout runs out are reported with status 'timeout' and the
+    finished ones are returned.
+    """
+    known_urls = known_urls or {}
+    wanted = []
+    for target in targets:
+        job_id = job_id_of(target)
+        url = target if target.startswith("http") else known_urls.get(job_id)
+        wanted.append((target, job_id, url))
+
+    cached = cached_details([job_id for _, job_id, _ in wanted if job_id], max_age)
+    results = {}
+    for target, job_id, _ in wanted:
+        if job_id is None:
+            results[target] = {"target": target, "status": "error", "error": "Not a jobId or job URL"}
+        elif job_id in cached:
+            results[target] = {"jobId": job_id, "status": "cached", "detail": cached[job_id]}
+
+    total = len(wanted)
+    done = len(results)
+    if on_progress is not None and done:
+        await on_progress(done, total)
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    login_error = None
+
+    async def fetch_one(target, job_id, url):
+        nonlocal done, login_error
+        async with semaphore:
+            try:
+                # One expired login fails the rest without relaunching the browser for each
+                if login_error is not None:
+                    raise login_error
+                detail = await fetch_job_detail(await get_context(), job_id=job_id, url=url)
+                results[target] = {"jobId": job_id, "status": "fetched", "detail": detail}
+            except session.LoginRequiredError as e:
+                login_error = e
+                results[target] = {"jobId": job_id, "status": "login_required", "error": str(e)}
+            except rate_limiter.BlockedError as e:
+                results[target] = {"jobId": job_id, "status": "blocked", "error": str(e)}
+            except Exception as e:
+                results[target] = {"jobId": job_id, "status": "error", "error": str(e)}
+        done += 1
+        if on_progress is not None:
+            await on_progress(done, total)
+
+    tasks = {}
+    for target, job_id, url in wanted:
+        if target not in results and target not in tasks:
+            tasks[target] = asyncio.create_task(fetch_one(target, job_id, url))
+    if tasks:
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return [
+        results.get(target) or {"jobId": job_id, "status": "timeout"}
+        for target, job_id, _ in wanted
+    ]
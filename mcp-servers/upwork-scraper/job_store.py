@@ -0,0 +1,398 @@
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import alerts
+import client_cache
+import competition
+import metrics
+import review_index
+import rollups
+import summarizer
+
+# SQLite database holding every job we have ever scraped
+DB_PATH = os.environ.get("UPWORK_DB_PATH", str(Path(__file__).parent / "upwork_jobs.db"))
+
+# Country labels differ between the feed and detail pages ("USA" vs "United States")
+COUNTRY_ALIASES = {
+    "united states": "USA",
+    "united states of america": "USA",
+    "us": "USA",
+    "united kingdom": "United Kingdom",
+    "uk": "United Kingdom",
+    "gbr": "United Kingdom",
+    "can": "Canada",
+    "aus": "Australia",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL UNIQUE,
+    title TEXT,
+    description TEXT,
+    skills TEXT,
+    client TEXT,
+    client_country TEXT,
+    client_spent TEXT,
+    budget_text TEXT,
+    budget_type TEXT,
+    budget_min REAL,
+    budget_max REAL,
+    proposals TEXT,
+    posted_text TEXT,
+    posted_at REAL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    url TEXT,
+    details TEXT,
+    details_fetched_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs(posted_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs(client_country, posted_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_budget ON jobs(budget_max);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, skills, client,
+    content='jobs', content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, description, skills, client)
+    VALUES (new.id, new.title, new.description, new.skills, new.client);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, skills, client)
+    VALUES ('delete', old.id, old.title, old.description, old.skills, old.client);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, description, skills, client ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, skills, client)
+    VALUES ('delete', old.id, old.title, old.description, old.skills, old.client);
+    INSERT INTO jobs_fts(rowid, title, description, skills, client)
+    VALUES (new.id, new.title, new.description, new.skills, new.client);
+END;
+"""
+
+# Search ranking weights for (title, description, skills, client)
+BM25_WEIGHTS = (10.0, 1.0, 5.0, 2.0)
+
+_connection = None
+
+
+def get_connection():
+    """Open (once) the job database and make sure the schema exists"""
+    global _connection
+
+    if _connection is not None:
+        return _connection
+
+    _connection = sqlite3.connect(DB_PATH)
+    _connection.row_factory = sqlite3.Row
+    _connection.execute("PRAGMA journal_mode=WAL")
+    _connection.execute("PRAGMA synchronous=NORMAL")
+    _connection.executescript(SCHEMA)
+    # Every module's tables are created here, not on first use: executescript
+    # commits, and first use can be inside another transaction
+    for module in (rollups, competition, alerts, client_cache, metrics, review_index, summarizer):
+        _connection.executescript(module.SCHEMA)
+    return _connection
+
+
+def clean(value):
+    """Turn the scraper's 'N/A' placeholders and blank strings into None"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value or value == "N/A":
+            return None
+    return value
+
+
+def normalize_country(country):
+    """Map the different spellings of a country onto one label"""
+    country = clean(country)
+    if country is None:
+        return None
+    return COUNTRY_ALIASES.get(country.lower(), country)
+
+
+def parse_budget(text):
+    """Parse 'Hourly: $15-$38' / 'Est. budget: $500' into (type, min, max) in USD"""
+    text = clean(text)
+    if text is None:
+        return None, None, None
+
+    amounts = []
+    for number, suffix in re.findall(r"\$\s*([\d,]+(?:\.\d+)?)\s*([kK])?", text):
+        amount = float(number.replace(",", ""))
+        if suffix:
+            amount *= 1000
+        amounts.append(amount)
+
+    lowered = text.lower()
+    budget_type = "hourly" if ("hour" in lowered or "/hr" in lowered) else "fixed"
+
+    if not amounts:
+        return budget_type, None, None
+    return budget_type, min(amounts), max(amounts)
+
+
+def parse_posted(text, now=None):
+    """Turn '37 minutes ago' / 'yesterday' into an approximate epoch timestamp"""
+    text = clean(text)
+    now = now if now is not None else time.time()
+    if text is None:
+        return None
+
+    lowered = text.lower()
+    if "just now" in lowered or "second" in lowered:
+        return now
+    if "yesterday" in lowered:
+        return now - 86400
+    if "last week" in lowered:
+        return now - 7 * 86400
+    if "last month" in lowered:
+        return now - 30 * 86400
+
+    units = {
+        "minute": 60,
+        "hour": 3600,
+        "day": 86400,
+        "week": 7 * 86400,
+        "month": 30 * 86400,
+    }
+    match = re.search(r"(\d+)\s*(minute|hour|day|week|month)", lowered)
+    if match:
+        return now - int(match.group(1)) * units[match.group(2)]
+    return None
+
+
+def day_of(timestamp):
+    """UTC calendar day (YYYY-MM-DD) for an epoch timestamp"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _skills_text(job):
+    skills = job.get("skills")
+    if isinstance(skills, (list, tuple)):
+        return ", ".join(s for s in skills if s)
+    return clean(skills)
+
+
+def _client_text(job):
+    parts = [job.get(key) for key in ("clientCountry", "clientCity", "clientSpent", "clientRating")]
+    parts = [str(clean(p)) for p in parts if clean(p) is not None]
+    return " ".join(parts) or None
+
+
+def _job_row(job, now):
+    budget_type, budget_min, budget_max = parse_budget(job.get("budget"))
+    return {
+        "job_id": clean(job.get("jobId")),
+        "title": clean(job.get("title")),
+        "description": clean(job.get("description")),
+        "skills": _skills_text(job),
+        "client": _client_text(job),
+        "client_country": normalize_country(job.get("clientCountry")),
+        "client_spent": clean(job.get("clientSpent")),
+        "budget_text": clean(job.get("budget")),
+        "budget_type": budget_type,
+        "budget_min": budget_min,
+        "budget_max": budget_max,
+        "proposals": clean(job.get("proposals")),
+        "posted_text": clean(job.get("posted")),
+        "posted_at": parse_posted(job.get("posted"), now) or now,
+        "first_seen": now,
+        "last_seen": now,
+        "url": clean(job.get("url")),
+    }
+
+
+def save_jobs(jobs, scraped_at=None):
+    """Insert or refresh a batch of scraped jobs. Returns the jobIds seen for the first time."""
+    conn = get_connection()
+    now = scraped_at if scraped_at is not None else time.time()
+
+    # Backfilled records carry the time their snapshot was taken
+    rows = [_job_row(job, job.get("scrapedAt") or now) for job in jobs]
+    rows = [row for row in rows if row["job_id"] is not None]
+    if not rows:
+        return []
+
+    ids = list(dict.fromkeys(row["job_id"] for row in rows))
+    existing = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        for r in conn.execute(
+            f"SELECT job_id, skills FROM jobs WHERE job_id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ):
+            existing[r["job_id"]] = r["skills"]
+
+    # Rollups count each job once: new jobs go into every dimension, and a known
+    # job only adds its skills the first time we learn them (from a detail page).
+    new_rows = {}
+    newly_skilled = {}
+    for row in rows:
+        job_id = row["job_id"]
+        if job_id not in existing:
+            new_rows.setdefault(job_id, row)
+        elif row["skills"] and not existing[job_id]:
+            newly_skilled.setdefault(job_id, row)
+
+    with conn:
+        # Fields we get from every scrape are refreshed; first_seen/posted_at keep
+        # their original values so the posting time doesn't drift on re-scrapes.
+        conn.executemany("""
+            INSERT INTO jobs (job_id, title, description, skills, client, client_country,
+                              client_spent, budget_text, budget_type, budget_min, budget_max,
+                              proposals, posted_text, posted_at, first_seen, last_seen, url)
+            VALUES (:job_id, :title, :description, :skills, :client, :client_country,
+                    :client_spent, :budget_text, :budget_type, :budget_min, :budget_max,
+                    :proposals, :posted_text, :posted_at, :first_seen, :last_seen, :url)
+            ON CONFLICT(job_id) DO UPDATE SET
+                title = COALESCE(excluded.title, title),
+                description = CASE
+                    WHEN length(COALESCE(excluded.description, '')) > length(COALESCE(description, ''))
+                    THEN excluded.description ELSE description END,
+                skills = COALESCE(excluded.skills, skills),
+                client = COALESCE(excluded.client, client),
+                client_country = COALESCE(excluded.client_country, client_country),
+                client_spent = COALESCE(excluded.client_spent, client_spent),
+                budget_text = COALESCE(excluded.budget_text, budget_text),
+                budget_type = COALESCE(excluded.budget_type, budget_type),
+                budget_min = COALESCE(excluded.budget_min, budget_min),
+                budget_max = COALESCE(excluded.budget_max, budget_max),
+                proposals = COALESCE(excluded.proposals, proposals),
+                last_seen = MAX(last_seen, excluded.last_seen),
+                url = COALESCE(excluded.url, url)
+        """, rows)
+        rollups.apply_batch(conn, list(new_rows.values()))
+        rollups.apply_batch(conn, list(newly_skilled.values()), dims=("skill",))
+        competition.record_observations(conn, jobs, now)
+
+    return list(new_rows)
+
+
+def upsert_details(records, fetched_at=None):
+    """Store parsed job detail pages: refresh the searchable columns and keep the full record"""
+    now = fetched_at if fetched_at is not None else time.time()
+    new_ids = save_jobs(records, now)
+
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            "UPDATE jobs SET details = ?, details_fetched_at = ? WHERE job_id = ?",
+            [
+                (
+                    json.dumps({k: v for k, v in r.items() if k != "scrapedAt"}),
+                    r.get("scrapedAt") or now,
+                    r["jobId"],
+                )
+                for r in records if r.get("jobId")
+            ],
+        )
+    return new_ids
+
+
+def parse_proposals(text):
+    """Parse '10 to 15' / 'Less than 5' / '50+' into a (low, high) proposal count"""
+    text = clean(text)
+    if text is None:
+        return None, None
+
+    numbers = [int(n) for n in re.findall(r"\d+", text)]
+    if not numbers:
+        return None, None
+
+    lowered = text.lower()
+    if "less than" in lowered:
+        return 0, numbers[0]
+    if "+" in text or "more than" in lowered:
+        return numbers[0], None
+    return min(numbers), max(numbers)
+
+
+def _fts_query(text):
+    """Quote each word so user input like 'Make.com' or 'C++' can't break FTS5 syntax"""
+    tokens = re.findall(r"\w+", text or "")
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def _day_start(day):
+    return datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
+
+def search_jobs(query=None, min_budget=None, max_budget=None, budget_type=None,
+                country=None, posted_after=None, posted_before=None, limit=20):
+    """Ranked full-text search over stored jobs with budget/country/date filters"""
+    conn = get_connection()
+
+    where = []
+    params = []
+
+    match = _fts_query(query)
+    if match:
+        sql = (
+            "SELECT j.*, bm25(jobs_fts, {}, {}, {}, {}) AS rank "
+            "FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid"
+        ).format(*BM25_WEIGHTS)
+        where.append("jobs_fts MATCH ?")
+        params.append(match)
+        order = "rank"
+    else:
+        sql = "SELECT j.*, NULL AS rank FROM jobs j"
+        order = "j.posted_at DESC"
+
+    if min_budget is not None:
+        where.append("j.budget_max >= ?")
+        params.append(float(min_budget))
+    if max_budget is not None:
+        where.append("j.budget_min <= ?")
+        params.append(float(max_budget))
+    if budget_type:
+        where.append("j.budget_type = ?")
+        params.append(budget_type)
+    if country:
+        where.append("j.client_country = ? COLLATE NOCASE")
+        params.append(normalize_country(country))
+    if posted_after:
+        where.append("j.posted_at >= ?")
+        params.append(_day_start(posted_after))
+    if posted_before:
+        where.append("j.posted_at < ?")
+        params.append(_day_start(posted_before) + 86400)
+
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(int(limit))
+
+    results = []
+    for row in conn.execute(sql, params):
+        results.append({
+            "jobId": row["job_id"],
+            "title": row["title"],
+            "description": row["description"],
+            "skills": row["skills"],
+            "budget": row["budget_text"],
+            "budgetType": row["budget_type"],
+            "budgetMin": row["budget_min"],
+            "budgetMax": row["budget_max"],
+            "clientCountry": row["client_country"],
+            "clientSpent": row["client_spent"],
+            "proposals": row["proposals"],
+            "postedDate": day_of(row["posted_at"]),
+            "url": row["url"],
+            "rank": row["rank"],
+        })
+    return results
@@ -0,0 +1,169 @@
+import json
+import os
+import time
+
+import extractor
+import models
+
+# Set UPWORK_LIVE_FEED=0 to go back to re-reading every tile on each scrape
+LIVE_FEED_ENABLED = os.environ.get("UPWORK_LIVE_FEED", "1") != "0"
+
+BINDING_NAME = "__upworkPushTiles"
+
+# Reads tiles with textContent (no layout) using extractor.TILE_SELECTORS.
+# Shared by the observer and the one-shot scrape so both return the same fields.
+TILE_READER = """
+    const SELECTORS = %(selectors)s;
+
+    const text = el => el ? el.textContent.replace(/\\s+/g, ' ').trim() : null;
+
+    const jobIdOf = link => {
+        const match = link.href.match(/_(~0\\d+)/);
+        return match ? match[1] : null;
+    };
+
+    const readTile = tile => {
+        const link = tile.querySelector(SELECTORS.title);
+        if (!link) return null;
+        const job = {jobId: jobIdOf(link), title: text(link), url: link.href};
+        for (const [field, selector] of Object.entries(SELECTORS)) {
+            if (field !== 'tile' && field !== 'title') job[field] = text(tile.querySelector(selector));
+        }
+        return job;
+    };
+""" % {"selectors": json.dumps(extractor.TILE_SELECTORS)}
+
+# Every tile on the page, in page order, read once
+READ_TILES_SCRIPT = """
+() => {
+%(reader)s
+    return Array.from(document.querySelectorAll(SELECTORS.tile)).map(readTile).filter(job => job && job.jobId);
+}
+""" % {"reader": TILE_READER}
+
+# Installed in the feed page. A tile is only pushed when it is new or its text
+# changed since the last push. Each push also carries the jobIds of the tiles
+# still in the document, in page order.
+OBSERVER_SCRIPT = """
+(() => {
+    if (window.__upworkLiveFeed) return;
+    window.__upworkLiveFeed = true;
+%(reader)s
+    const BINDING = %(binding)s;
+    const lastPushed = new WeakMap();
+    const dirty = new Set();
+    let lastPresent = null;
+    let timer = null;
+
+    const flush = () => {
+        timer = null;
+        const jobs = [];
+        for (const tile of dirty) {
+            if (!tile.isConnected) continue;
+            const job = readTile(tile);
+            if (!job) continue;
+            const signature = JSON.stringify(job);
+            if (lastPushed.get(tile) === signature) continue;
+            lastPushed.set(tile, signature);
+            jobs.push(job);
+        }
+        dirty.clear();
+
+        const present = [];
+        document.querySelectorAll(SELECTORS.tile).forEach(tile => {
+            const link = tile.querySelector(SELECTORS.title);
+            const jobId = link ? jobIdOf(link) : null;
+            if (jobId) present.push(jobId);
+        });
+        const presentKey = present.join(',');
+        if ((jobs.length || presentKey !== lastPresent) && window[BINDING]) {
+            lastPresent = presentKey;
+            window[BINDING](jobs, present);
+        }
+    };
+
+    const mark = node => {
+        const el = node.nodeType === 1 ? node : node.parentElement;
+        if (!el) return;
+        const tile = el.closest(SELECTORS.tile);
+        if (tile) dirty.add(tile);
+        if (el.querySelectorAll) el.querySelectorAll(SELECTORS.tile).forEach(t => dirty.add(t));
+    };
+
+    const start = () => {
+        document.querySelectorAll(SELECTORS.tile).forEach(t => dirty.add(t));
+        new MutationObserver(mutations => {
+            let removed = false;
+            for (const m of mutations) {
+                mark(m.target);
+                m.addedNodes.forEach(mark);
+                removed = removed || m.removedNodes.length > 0;
+            }
+            // Coalesce a burst of DOM updates into one push
+            if ((dirty.size || removed) && timer === null) timer = setTimeout(flush, 100);
+        }).observe(document.body, {childList: true, subtree: true, characterData: true});
+        flush();
+    };
+
+    if (document.body) start();
+    else document.addEventListener('DOMContentLoaded', start);
+})();
+""" % {"reader": TILE_READER, "binding": json.dumps(BINDING_NAME)}
+
+
+class LiveFeed:
+    """Continuously updated set of feed jobs, pushed from the page as tiles render or change.
+
+    on_jobs(jobs, discovered_at) is awaited with only the new or changed jobs.
+    snapshot() returns just the tiles currently on the page; the bounded
+    cache keeps earlier ones as history.
+    """
+
+    def __init__(self, on_jobs=None, max_jobs=5000):
+        self.on_jobs = on_jobs
+        self.jobs = models.JobCache(max_jobs)
+        # jobIds of the tiles in the document, in page order (newest at the top)
+        self.present = []
+        self.last_push = None
+        self.attached_page = None
+
+    async def attach(self, page):
+        """Install the observer in the page now and on every later navigation"""
+        if self.attached_page is page:
+            return
+        await page.expose_function(BINDING_NAME, self._receive)
+        await page.add_init_script(OBSERVER_SCRIPT)
+        page.on("framenavigated", self._on_navigated)
+        self.present = []
+        await page.evaluate(OBSERVER_SCRIPT)
+        self.attached_page = page
+        print("📡 Live feed attached")
+
+    def _on_navigated(self, frame):
+        # A new document starts with no tiles; its observer pushes the ones it renders
+        if frame.parent_frame is None:
+            self.present = []
+
+    async def _receive(self, raw_jobs, present=None):
+        discovered_at = time.time()
+        self.last_push = discovered_at
+
+        jobs = []
+        for raw in raw_jobs:
+            job = models.Job.from_dict(raw)
+            if job.jobId is not None:
+                jobs.append(job)
+        self.jobs.put(jobs)
+        if present is not None:
+            self.present = list(dict.fromkeys(present))
+
+        if jobs and self.on_jobs is not None:
+            try:
+                await self.on_jobs(jobs, discovered_at)
+            except Exception as e:
+                print(f"⚠️  Live feed handler failed: {e}")
+
+    def snapshot(self, limit=None):
+        """Jobs currently on the feed page, in page order (newest first)"""
+        ids = self.present[:limit] if limit else self.present
+        return [job for job in (self.jobs.get(job_id) for job_id in ids) if job is not None]
@@ -0,0 +1,91 @@
+import argparse
+import json
+import math
+import os
+import time
+
+import job_store
+
+# Samples older than this are deleted; the watchdog alone records a few a minute
+RETENTION_DAYS = float(os.environ.get("UPWORK_METRICS_RETENTION_DAYS", "30"))
+PRUNE_SECONDS = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    name TEXT NOT NULL,
+    at REAL NOT NULL,
+    value REAL NOT NULL,
+    labels TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_metrics_name_at ON metrics(name, at);
+CREATE INDEX IF NOT EXISTS idx_metrics_at ON metrics(at);
+"""
+
+_last_prune = 0
+
+
+def record_metric(name, value, at=None, **labels):
+    """Store one sample of a named metric, e.g. record_metric('time_to_detail', 4.2, jobId=...)"""
+    global _last_prune
+
+    conn = job_store.get_connection()
+    now = time.time()
+    with conn:
+        conn.execute(
+            "INSERT INTO metrics (name, at, value, labels) VALUES (?, ?, ?, ?)",
+            (name, at if at is not None else now, float(value), json.dumps(labels) if labels else None),
+        )
+        if RETENTION_DAYS > 0 and now - _last_prune >= PRUNE_SECONDS:
+            conn.execute("DELETE FROM metrics WHERE at < ?", (now - RETENTION_DAYS * 86400,))
+            _last_prune = now
+
+
+def summarize(name, since_hours=24):
+    """Count, mean, p50, p90 and max of a metric over the last since_hours"""
+    conn = job_store.get_connection()
+    values = [
+        r["value"]
+        for r in conn.execute(
+            "SELECT value FROM metrics WHERE name = ? AND at >= ? ORDER BY value",
+            (name, time.time() - since_hours * 3600),
+        )
+    ]
+    if not values:
+        return {"name": name, "count": 0}
+
+    def rank(q):
+        return values[max(math.ceil(q * len(values)) - 1, 0)]
+
+    return {
+        "name": name,
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(rank(0.5), 3),
+        "p90": round(rank(0.9), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def metric_names(since_hours=24):
+    """Names of the metrics recorded over the last since_hours"""
+    conn = job_store.get_connection()
+    return [
+        r["name"]
+        for r in conn.execute(
+            "SELECT DISTINCT name FROM metrics WHERE at >= ? ORDER BY name", (time.time() - since_hours * 3600,)
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize recorded metrics")
+    parser.add_argument("names", nargs="*", help="Metrics to summarize (default: every metric in the window)")
+    parser.add_argument("--hours", type=float, default=24, help="How far back to look (default: 24)")
+    args = parser.parse_args()
+
+    print(json.dumps([summarize(name, args.hours) for name in args.names or metric_names(args.hours)], indent=2))
+
+
+if __name__ == "__main__":
+    main()
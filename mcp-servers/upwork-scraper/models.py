@@ -0,0 +1,202 @@
+import json
+import re
+import sys
+import zlib
+
+# Page text the scrapers use for "not found"
+PLACEHOLDERS = {"", "N/A"}
+
+JOB_ID_RE = re.compile(r"~0[1-9]\d*")
+
+FEED_URL_SUFFIX = "/?referrer_url_path=find_work_home"
+
+# Descriptions longer than this are kept zlib-compressed, primed with phrases
+# that recur across job posts so even short texts shrink
+COMPRESS_OVER = 64
+DESCRIPTION_ZDICT = (
+    b"We are looking for an experienced  to help us with our . The ideal candidate will have experience with "
+    b"and a strong understanding of  Responsibilities include  Requirements: Proven experience in  "
+    b"Please include examples of your previous work in your proposal. This is a long-term project. "
+    b"We are seeking a skilled professional to  the role involves setting up  and creating custom "
+    b"automation integration workflow CRM API website design development data management marketing business "
+    b"ability to communicate effectively, attention to detail, knowledge of  familiarity with  "
+    b"Looking forward to working with you."
+)
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return None if value in PLACEHOLDERS else value
+    return value
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _slug(title):
+    # Upwork's URL slug keeps the title's words longer than two characters
+    return "-".join(w for w in re.split(r"[^A-Za-z0-9]+", title) if len(w) > 2)
+
+
+class Job:
+    """One scraped job, with slots instead of a per-job dict.
+
+    Reads like the dicts it replaces (job.get("title"), job["jobId"]), so the
+    store, scheduler and alerts take either. Missing values are None, never
+    'N/A'. A scraped URL that matches the feed pattern is not stored, only
+    rebuilt from title and jobId; a job scraped without a URL has none.
+    """
+
+    __slots__ = (
+        "_job_id", "title", "_description", "_url", "budget", "posted",
+        "clientCountry", "clientSpent", "clientPaymentVerified", "proposals",
+        "experienceLevel", "duration", "skills", "extra",
+    )
+
+    FIELDS = (
+        "jobId", "title", "description", "url", "budget", "posted",
+        "clientCountry", "clientSpent", "clientPaymentVerified", "proposals",
+        "experienceLevel", "duration", "skills", "extra",
+    )
+
+    def __init__(self, jobId=None, title=None, description=None, url=None, budget=None, posted=None,
+                 clientCountry=None, clientSpent=None, clientPaymentVerified=None, proposals=None,
+                 experienceLevel=None, duration=None, skills=None, extra=None):
+        self.jobId = _clean(jobId)
+        self.title = _clean(title)
+        self.description = _clean(description)
+        # Everything else (cached client data, detail fields, scrapedAt) lives in extra
+        self.extra = extra or None
+        self.url = _clean(url)
+        # Values shared by many jobs (countries, budget bands, skills) are interned, one copy each
+        self.budget = _intern(_clean(budget))
+        self.posted = _intern(_clean(posted))
+        self.clientCountry = _intern(_clean(clientCountry))
+        self.clientSpent = _intern(_clean(clientSpent))
+        self.clientPaymentVerified = _intern(_clean(clientPaymentVerified))
+        self.proposals = _intern(_clean(proposals))
+        self.experienceLevel = _intern(_clean(experienceLevel))
+        self.duration = _intern(_clean(duration))
+        if isinstance(skills, str):
+            skills = skills.split(",")
+        self.skills = tuple(sys.intern(s.strip()) for s in skills if s.strip()) if skills else None
+
+    @property
+    def jobId(self):
+        value = self._job_id
+        return f"~0{value}" if isinstance(value, int) else value
+
+    @jobId.setter
+    def jobId(self, value):
+        # '~021989774412036501954' is kept as the integer after '~0', half the size of the string
+        if isinstance(value, str) and JOB_ID_RE.fullmatch(value):
+            value = int(value[2:])
+        self._job_id = value
+
+    @property
+    def description(self):
+        value = self._description
+        if isinstance(value, bytes):
+            decompressor = zlib.decompressobj(zdict=DESCRIPTION_ZDICT)
+            return (decompressor.decompress(value) + decompressor.flush()).decode("utf-8")
+        return value
+
+    @description.setter
+    def description(self, value):
+        if value is not None and len(value) > COMPRESS_OVER:
+            compressor = zlib.compressobj(9, zdict=DESCRIPTION_ZDICT)
+            value = compressor.compress(value.encode("utf-8")) + compressor.flush()
+        self._description = value
+
+    def _feed_url(self):
+        if self.jobId and self.title:
+            return f"https://www.upwork.com/jobs/{_slug(self.title)}_{self.jobId}{FEED_URL_SUFFIX}"
+        return None
+
+    @property
+    def url(self):
+        # True stands for "the scraped URL was the feed URL", rebuilt on demand
+        return self._feed_url() if self._url is True else self._url
+
+    @url.setter
+    def url(self, value):
+        # Only a URL that differs from the rebuilt feed URL takes up space
+        self._url = True if value is not None and value == self._feed_url() else value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Job from a scraped dict; keys it has no field for are kept in extra"""
+        known = {k: v for k, v in data.items() if k in cls.FIELDS and k != "extra"}
+        extra = {k: v for k, v in data.items() if k not in cls.FIELDS}
+        return cls(**known, extra=extra or data.get("extra"))
+
+    def to_dict(self):
+        """Plain dict of the fields that are set"""
+        data = {}
+        for field in self.FIELDS[:-1]:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = list(value) if field == "skills" else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    def get(self, key, default=None):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return default
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS and key != "extra":
+            setattr(self, key, value)
+        else:
+            self.extra = dict(self.extra or {}, **{key: value})
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __repr__(self):
+        return f"Job({self.jobId!r}, {self.title!r})"
+
+
+class JobCache:
+    """Most recently seen jobs by jobId, bounded so a long-running server stays small"""
+
+    def __init__(self, max_jobs=5000):
+        self.max_jobs = max_jobs
+        # A plain dict keeps insertion order at less per-entry overhead than OrderedDict
+        self._jobs = {}
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def put(self, jobs):
+        for job in jobs:
+            # Keyed by the job's compact id rather than a second copy of the string
+            key = job._job_id
+            if key is None:
+                continue
+            self._jobs.pop(key, None)
+            self._jobs[key] = job
+        while len(self._jobs) > self.max_jobs:
+            del self._jobs[next(iter(self._jobs))]
+
+    def get(self, job_id):
+        if isinstance(job_id, str) and JOB_ID_RE.fullmatch(job_id):
+            job_id = int(job_id[2:])
+        return self._jobs.get(job_id)
@@ -0,0 +1,121 @@
+import gzip
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+# Where the scrapers append their output
+OUTPUT_DIR = Path(os.environ.get("UPWORK_OUTPUT_DIR", str(Path(__file__).parent / "scraped_jobs")))
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class NdjsonSink:
+    """Append-only NDJSON writer: one compact JSON record per line, fsynced per batch.
+
+    Records go to '<prefix>.ndjson'. When it grows past max_bytes, or a batch
+    arrives on a new day, the file is gzipped to '<prefix>-YYYYMMDD-NNNN.ndjson.gz'
+    and a fresh one is started. A crash can at worst leave a torn final line,
+    which iter_records skips; earlier records are never rewritten.
+    """
+
+    def __init__(self, directory=OUTPUT_DIR, prefix="scraped_jobs",
+                 max_bytes=DEFAULT_MAX_BYTES, rotate_daily=True):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.active_path = self.directory / f"{prefix}.ndjson"
+
+    def _active_day(self):
+        return time.strftime("%Y%m%d", time.localtime(self.active_path.stat().st_mtime))
+
+    def _needs_rotation(self):
+        if not self.active_path.exists() or self.active_path.stat().st_size == 0:
+            return False
+        if self.active_path.stat().st_size >= self.max_bytes:
+            return True
+        return self.rotate_daily and self._active_day() != time.strftime("%Y%m%d")
+
+    def rotate(self):
+        """Compress the active file into the archive and start a new one"""
+        if not self.active_path.exists() or self.active_path.stat().st_size == 0:
+            return None
+
+        day = self._active_day()
+        seq = len(list(self.directory.glob(f"{self.prefix}-{day}-*.ndjson.gz")))
+        archive_path = self.directory / f"{self.prefix}-{day}-{seq:04d}.ndjson.gz"
+        tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+
+        with open(self.active_path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, archive_path)
+        self.active_path.unlink()
+        return archive_path
+
+    def write_batch(self, records):
+        """Append records and fsync once for the whole batch. Returns the number written."""
+        if self._needs_rotation():
+            self.rotate()
+
+        lines = [
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            for record in records
+        ]
+        count = len(lines)
+        if not count:
+            return 0
+
+        # Binary, so a write torn inside a multi-byte character can't break the check
+        with open(self.active_path, "a+b") as f:
+            # Start on a fresh line if a previous write was cut off mid-record
+            if f.tell() > 0:
+                f.seek(f.tell() - 1)
+                if f.read(1) != b"\n":
+                    lines.insert(0, b"\n")
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        return count
+
+
+def _files_in(directory, prefix):
+    """Archived files oldest first, then the active file"""
+    directory = Path(directory)
+    pattern = f"{prefix}*.ndjson*" if prefix else "*.ndjson*"
+    files = sorted(p for p in directory.glob(pattern) if p.name.endswith(".ndjson.gz"))
+    files += sorted(p for p in directory.glob(pattern) if p.name.endswith(".ndjson"))
+    return files
+
+
+def _iter_file(path):
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                # Torn final line from an interrupted write
+                continue
+
+
+def iter_records(path=OUTPUT_DIR, prefix=None):
+    """Lazily yield records from an NDJSON file or a sink directory, in write order.
+
+    Only one line is held in memory at a time, so multi-GB histories can be
+    streamed. Plain '.json' arrays (the old scraped_jobs.json) are also accepted.
+    """
+    path = Path(path)
+    if path.is_dir():
+        for file_path in _files_in(path, prefix):
+            yield from _iter_file(file_path)
+    elif path.suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            yield from json.load(f)
+    else:
+        yield from _iter_file(path)
@@ -0,0 +1,217 @@
+import asyncio
+import os
+import re
+import sqlite3
+import time
+from urllib.parse import urlparse
+
+import job_store
+
+# Ceiling for page loads against Upwork, shared by every tab and process
+MAX_PAGES_PER_MINUTE = float(os.environ.get("UPWORK_MAX_PAGES_PER_MINUTE", "20"))
+MIN_PAGES_PER_MINUTE = 1.0
+BURST = 3
+
+# After a block the rate is halved and nothing is loaded for a cooldown that
+# doubles with each consecutive block. Once clear for RECOVERY_DELAY, every
+# successful load adds back a small step of rate.
+BASE_COOLDOWN = 30
+MAX_COOLDOWN = 15 * 60
+RECOVERY_DELAY = 5 * 60
+RECOVERY_STEP = MAX_PAGES_PER_MINUTE / 40
+
+# Another process's write lock is waited out with asyncio.sleep between short
+# tries, not SQLite's blocking busy handler, so the event loop keeps running
+BUSY_TIMEOUT = 0.05
+LOCK_RETRY_SECONDS = 0.05
+LOCK_WAIT_SECONDS = 30
+
+THROTTLE_STATUSES = {403, 429, 503}
+CHALLENGE_TITLES = ("just a moment", "attention required", "access denied", "please verify you are a human")
+# Where Cloudflare serves its checks. Only the host, path prefix and its own query
+# tokens count: job URLs carry the title as a slug, e.g. '/jobs/Captcha-Solver_~02...'.
+CHALLENGE_HOSTS = ("challenges.cloudflare.com",)
+CHALLENGE_PATH_PREFIX = "/cdn-cgi/"
+CHALLENGE_QUERY_RE = re.compile(r"(?:^|&)__cf_chl_")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    per_minute REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    last_block REAL NOT NULL DEFAULT 0,
+    consecutive_blocks INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+class BlockedError(Exception):
+    """Upwork answered with a challenge page or a throttling response"""
+
+
+class RateLimiter:
+    """Token bucket kept in SQLite so every process hitting Upwork draws from the same budget.
+
+    The rate adapts: on_block() halves it and pauses all loads for a cooldown,
+    on_success() creeps it back up towards MAX_PAGES_PER_MINUTE.
+    """
+
+    def __init__(self, name="upwork", db_path=None):
+        self.name = name
+        self.db_path = db_path or job_store.DB_PATH
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            # Autocommit connection of its own, so BEGIN IMMEDIATE never nests in job_store's transactions
+            conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT, isolation_level=None)
+            try:
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(SCHEMA)
+                conn.execute(
+                    "INSERT OR IGNORE INTO rate_limit (name, tokens, updated_at, per_minute) VALUES (?, ?, ?, ?)",
+                    (self.name, BURST, time.time(), MAX_PAGES_PER_MINUTE),
+                )
+            except BaseException:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    async def _update(self, change):
+        """Run change(state, now) -> dict of new values inside one write transaction"""
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while True:
+            try:
+                return self._transaction(change)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or time.monotonic() >= deadline:
+                    raise
+            await asyncio.sleep(LOCK_RETRY_SECONDS)
+
+    def _transaction(self, change):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = dict(conn.execute("SELECT * FROM rate_limit WHERE name = ?", (self.name,)).fetchone())
+            now = time.time()
+            # Refill for the time since the last update
+            rate = state["per_minute"] / 60
+            state["tokens"] = min(BURST, state["tokens"] + max(now - state["updated_at"], 0) * rate)
+            state["updated_at"] = now
+            result = change(state, now)
+            conn.execute(
+                """UPDATE rate_limit SET tokens = ?, updated_at = ?, per_minute = ?, blocked_until = ?,
+                       last_block = ?, consecutive_blocks = ? WHERE name = ?""",
+                (state["tokens"], state["updated_at"], state["per_minute"], state["blocked_until"],
+                 state["last_block"], state["consecutive_blocks"], self.name),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    async def try_acquire(self):
+        """Take a token if one is available. Returns seconds to wait first (0 = go now)."""
+        def change(state, now):
+            if state["blocked_until"] > now:
+                return state["blocked_until"] - now
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                return 0
+            return (1 - state["tokens"]) * 60 / state["per_minute"]
+        return await self._update(change)
+
+    async def acquire(self):
+        """Wait until this process may load another page"""
+        while True:
+            wait = await self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def on_success(self):
+        def change(state, now):
+            state["consecutive_blocks"] = 0
+            if now - state["last_block"] >= RECOVERY_DELAY:
+                state["per_minute"] = min(MAX_PAGES_PER_MINUTE, state["per_minute"] + RECOVERY_STEP)
+        await self._update(change)
+
+    async def on_block(self, retry_after=None):
+        """Back off after a challenge or throttling response. Returns the cooldown in seconds."""
+        def change(state, now):
+            state["consecutive_blocks"] += 1
+            state["per_minute"] = max(MIN_PAGES_PER_MINUTE, state["per_minute"] / 2)
+            cooldown = min(MAX_COOLDOWN, BASE_COOLDOWN * 2 ** (state["consecutive_blocks"] - 1))
+            cooldown = max(cooldown, retry_after or 0)
+            state["blocked_until"] = max(state["blocked_until"], now + cooldown)
+            state["last_block"] = now
+            state["tokens"] = 0
+            return cooldown
+        return await self._update(change)
+
+    async def status(self):
+        """Current rate and cooldown, for logging"""
+        state = await self._update(lambda state, now: dict(state, now=now))
+        return {
+            "pagesPerMinute": round(state["per_minute"], 2),
+            "blockedFor": round(max(state["blocked_until"] - state["now"], 0), 1),
+            "consecutiveBlocks": state["consecutive_blocks"],
+        }
+
+
+limiter = RateLimiter()
+
+
+def is_challenge_url(url):
+    parts = urlparse(url)
+    host = (parts.hostname or "").lower()
+    return (
+        any(host == h or host.endswith("." + h) for h in CHALLENGE_HOSTS)
+        or parts.path.startswith(CHALLENGE_PATH_PREFIX)
+        or bool(CHALLENGE_QUERY_RE.search(parts.query))
+    )
+
+
+async def detect_block(page, response=None):
+    """Why the page is a challenge or throttle instead of content, or None if it looks fine"""
+    if response is not None and response.status in THROTTLE_STATUSES:
+        return f"HTTP {response.status}"
+    if is_challenge_url(page.url):
+        return f"challenge URL {page.url}"
+    try:
+        title = (await page.title()).lower()
+    except Exception:
+        return None
+    for marker in CHALLENGE_TITLES:
+        if marker in title:
+            return f"challenge page '{title}'"
+    return None
+
+
+def _retry_after(response):
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+
+
+async def polite_goto(page, url, **kwargs):
+    """page.goto through the shared rate limiter. Raises BlockedError on a challenge or throttle."""
+    await limiter.acquire()
+    response = await page.goto(url, **kwargs)
+
+    reason = await detect_block(page, response)
+    if reason is not None:
+        cooldown = await limiter.on_block(_retry_after(response))
+        print(f"🛑 Upwork is throttling us ({reason}); pausing page loads for {cooldown:.0f}s")
+        raise BlockedError(reason)
+
+    await limiter.on_success()
+    return response
@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import math
+import os
+import time
+
+import job_store
+
+STATUSES = ("new", "skipped", "applied", "in_crm")
+
+# Sized for this many reviewed jobs at this false-positive rate; grows by doubling
+BLOOM_CAPACITY = int(os.environ.get("UPWORK_REVIEW_BLOOM_CAPACITY", "100000"))
+BLOOM_ERROR_RATE = 0.001
+# How often unsynced review marks are pushed to the CRM, when a CRM hook is set
+CRM_SYNC_SECONDS = float(os.environ.get("UPWORK_CRM_SYNC_SECONDS", "300"))
+
+# seq is assigned when a job is first marked and only ever grows, so other
+# processes can load new jobIds by seq regardless of clocks
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_state (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    reason TEXT,
+    updated_at REAL NOT NULL,
+    synced INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_review_state_updated ON review_state(updated_at);
+CREATE INDEX IF NOT EXISTS idx_review_state_unsynced ON review_state(synced, updated_at);
+"""
+
+_index = None
+
+# async push(records) -> jobIds the CRM accepted. Set by the CRM connector.
+crm_hook = None
+
+
+class BloomFilter:
+    """Set membership in a few bits per item. 'No' is certain, 'maybe' needs a real lookup."""
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Two halves of one digest give every position (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class ReviewIndex:
+    """Bloom filter over every reviewed jobId, backed by the review_state table.
+
+    Most jobs in a feed have never been reviewed; the filter answers those
+    without touching SQLite, and the rest are read in one batched query.
+    Writes from other processes are picked up through PRAGMA data_version.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._rebuild()
+
+    def _rebuild(self, capacity=None):
+        count = self.conn.execute("SELECT COUNT(*) FROM review_state").fetchone()[0]
+        capacity = capacity or BLOOM_CAPACITY
+        while capacity < count * 2:
+            capacity *= 2
+        self.bloom = BloomFilter(capacity)
+        self.loaded_seq = 0
+        self._load_new()
+
+    def _load_new(self):
+        """Add every jobId marked since the last load, by this or any other process"""
+        self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        rows = self.conn.execute(
+            "SELECT seq, job_id FROM review_state WHERE seq > ? ORDER BY seq", (self.loaded_seq,)
+        ).fetchall()
+        if self.bloom.count + len(rows) > self.bloom.capacity:
+            self._rebuild(self.bloom.capacity * 2)
+            return
+        for r in rows:
+            self.bloom.add(r["job_id"])
+            self.loaded_seq = r["seq"]
+
+    def _refresh(self):
+        # data_version only changes when another connection commits
+        if self.conn.execute("PRAGMA data_version").fetchone()[0] != self.data_version:
+            self._load_new()
+
+    def check(self, job_ids):
+        """{jobId: {status, reason, updatedAt}} for the reviewed ones among job_ids"""
+        self._refresh()
+        maybe = [job_id for job_id in dict.fromkeys(job_ids) if job_id in self.bloom]
+
+        found = {}
+        for start in range(0, len(maybe), 500):
+            chunk = maybe[start:start + 500]
+            for r in self.conn.execute(
+                f"SELECT job_id, status, reason, updated_at FROM review_state WHERE job_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                if r["status"] != "new":
+                    found[r["job_id"]] = {"status": r["status"], "reason": r["reason"], "updatedAt": r["updated_at"]}
+        return found
+
+    def mark(self, job_ids, status, reason=None, synced=False, now=None):
+        """Record a review decision for each job. Returns the number of jobs marked."""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown review status {status!r}, expected one of {', '.join(STATUSES)}")
+        now = now if now is not None else time.time()
+        job_ids = [job_id for job_id in dict.fromkeys(job_ids) if job_id]
+
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO review_state (job_id, status, reason, updated_at, synced)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    status = excluded.status,
+                    reason = excluded.reason,
+                    updated_at = excluded.updated_at,
+                    synced = excluded.synced
+            """, [(job_id, status, reason, now, int(synced)) for job_id in job_ids])
+        self._load_new()
+        return len(job_ids)
+
+    def unsynced(self, limit=200):
+        return [
+            {"jobId": r["job_id"], "status": r["status"], "reason": r["reason"], "updatedAt": r["updated_at"]}
+            for r in self.conn.execute(
+                "SELECT job_id, status, reason, updated_at FROM review_state WHERE synced = 0 ORDER BY updated_at LIMIT ?",
+                (limit,),
+            )
+        ]
+
+    def mark_synced(self, records):
+        # Only if unchanged since it was pushed; a newer decision still needs syncing
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE review_state SET synced = 1 WHERE job_id = ? AND updated_at = ?",
+                [(r["jobId"], r["updatedAt"]) for r in records],
+            )
+
+
+def get_index():
+    global _index
+    if _index is None:
+        _index = ReviewIndex(job_store.get_connection())
+    return _index
+
+
+def check_reviewed(job_ids):
+    return get_index().check(job_ids)
+
+
+def mark_reviewed(job_ids, status, reason=None):
+    return get_index().mark(job_ids, status, reason)
+
+
+def record_crm_state(job_ids, reason=None):
+    """Jobs the CRM already holds, e.g. from a CRM export; nothing to push back"""
+    return get_index().mark(job_ids, "in_crm", reason, synced=True)
+
+
+async def sync_crm(push=None):
+    """Push review marks the CRM has not seen yet. Returns the number accepted."""
+    push = push or crm_hook
+    if push is None:
+        return 0
+    index = get_index()
+    pending = index.unsynced()
+    if not pending:
+        return 0
+    accepted = set(await push(pending))
+    index.mark_synced([r for r in pending if r["jobId"] in accepted])
+    return len(accepted)
+
+
+async def sync_loop():
+    while True:
+        try:
+            synced = await sync_crm()
+            if synced:
+                print(f"🔄 Synced {synced} review marks to the CRM")
+        except Exception as e:
+            print(f"⚠️  CRM sync failed: {e}")
+        await asyncio.sleep(CRM_SYNC_SECONDS)
@@ -0,0 +1,233 @@
+import math
+from collections import defaultdict
+
+import job_store
+
+# Dimensions every job is rolled up under. 'all' has a single key '*'.
+DIMENSIONS = ("all", "country", "skill")
+
+# Budget quantiles use a log-bucket sketch: each bucket spans a factor of GAMMA,
+# so any quantile is accurate to about +/-1% no matter how many jobs it covers.
+GAMMA = 1.02
+_LOG_GAMMA = math.log(GAMMA)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_counts (
+    dim TEXT NOT NULL,
+    key TEXT NOT NULL,
+    day TEXT NOT NULL,
+    jobs INTEGER NOT NULL DEFAULT 0,
+    hourly_n INTEGER NOT NULL DEFAULT 0,
+    hourly_sum REAL NOT NULL DEFAULT 0,
+    fixed_n INTEGER NOT NULL DEFAULT 0,
+    fixed_sum REAL NOT NULL DEFAULT 0,
+    proposals_n INTEGER NOT NULL DEFAULT 0,
+    proposals_sum REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (dim, key, day)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_rollup_counts_day ON rollup_counts(dim, day);
+
+CREATE TABLE IF NOT EXISTS rollup_budget_sketch (
+    dim TEXT NOT NULL,
+    key TEXT NOT NULL,
+    day TEXT NOT NULL,
+    budget_type TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (dim, key, day, budget_type, bucket)
+) WITHOUT ROWID;
+"""
+
+
+def bucket_of(value):
+    """Sketch bucket for a budget value"""
+    if value < 1:
+        return 0
+    return int(math.ceil(math.log(value) / _LOG_GAMMA))
+
+
+def bucket_value(bucket):
+    """Representative value of a sketch bucket"""
+    if bucket <= 0:
+        return 0.0
+    return 2 * GAMMA ** bucket / (GAMMA + 1)
+
+
+def _keys_for(row, dim):
+    if dim == "all":
+        return ["*"]
+    if dim == "country":
+        return [row["client_country"]] if row.get("client_country") else []
+    if dim == "skill":
+        skills = row.get("skills") or ""
+        return sorted({s.strip().lower() for s in skills.split(",") if s.strip()})
+    raise ValueError(f"Unknown rollup dimension: {dim}")
+
+
+def _budget_value(row):
+    low, high = row.get("budget_min"), row.get("budget_max")
+    if low is None and high is None:
+        return None
+    if low is None or high is None:
+        return low if high is None else high
+    return (low + high) / 2
+
+
+def _proposals_value(row):
+    low, high = job_store.parse_proposals(row.get("proposals"))
+    if low is None:
+        return None
+    return low if high is None else (low + high) / 2
+
+
+def apply_batch(conn, rows, dims=DIMENSIONS):
+    """Fold a batch of newly stored job rows into the aggregate tables"""
+    if not rows:
+        return
+
+    counts = defaultdict(lambda: [0, 0, 0.0, 0, 0.0, 0, 0.0])
+    sketch = defaultdict(int)
+
+    for row in rows:
+        day = job_store.day_of(row["posted_at"] or row["first_seen"])
+        budget = _budget_value(row)
+        proposals = _proposals_value(row)
+
+        for dim in dims:
+            for key in _keys_for(row, dim):
+                agg = counts[(dim, key, day)]
+                agg[0] += 1
+                if budget is not None:
+                    offset = 1 if row["budget_type"] == "hourly" else 3
+                    agg[offset] += 1
+                    agg[offset + 1] += budget
+                    sketch[(dim, key, day, row["budget_type"], bucket_of(budget))] += 1
+                if proposals is not None:
+                    agg[5] += 1
+                    agg[6] += proposals
+
+    conn.executemany("""
+        INSERT INTO rollup_counts (dim, key, day, jobs, hourly_n, hourly_sum, fixed_n, fixed_sum,
+                                   proposals_n, proposals_sum)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(dim, key, day) DO UPDATE SET
+            jobs = jobs + excluded.jobs,
+            hourly_n = hourly_n + excluded.hourly_n,
+            hourly_sum = hourly_sum + excluded.hourly_sum,
+            fixed_n = fixed_n + excluded.fixed_n,
+            fixed_sum = fixed_sum + excluded.fixed_sum,
+            proposals_n = proposals_n + excluded.proposals_n,
+            proposals_sum = proposals_sum + excluded.proposals_sum
+    """, [(*k, *v) for k, v in counts.items()])
+
+    conn.executemany("""
+        INSERT INTO rollup_budget_sketch (dim, key, day, budget_type, bucket, n)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(dim, key, day, budget_type, bucket) DO UPDATE SET n = n + excluded.n
+    """, [(*k, v) for k, v in sketch.items()])
+
+
+def rebuild():
+    """Recompute every rollup from the jobs table (after a backfill or schema change)"""
+    conn = job_store.get_connection()
+
+    with conn:
+        conn.execute("DELETE FROM rollup_counts")
+        conn.execute("DELETE FROM rollup_budget_sketch")
+        cursor = conn.execute("SELECT * FROM jobs")
+        while True:
+            batch = cursor.fetchmany(5000)
+            if not batch:
+                break
+            apply_batch(conn, [dict(r) for r in batch])
+
+
+def _quantiles(buckets, quantiles):
+    """Read quantiles from merged {bucket: count} sketch data"""
+    total = sum(buckets.values())
+    if total == 0:
+        return {q: None for q in quantiles}
+
+    ordered = sorted(buckets.items())
+    result = {}
+    for q in quantiles:
+        target = max(1, math.ceil(q * total))
+        seen = 0
+        for bucket, n in ordered:
+            seen += n
+            if seen >= target:
+                result[q] = round(bucket_value(bucket), 2)
+                break
+    return result
+
+
+def query_rollup(dim="all", key=None, start_day=None, end_day=None, budget_type="hourly",
+                 by_day=True, limit=20):
+    """Read aggregates for a dimension. Cost depends on keys x days, not on history size."""
+    if dim not in DIMENSIONS:
+        raise ValueError(f"Unknown rollup dimension: {dim}")
+    if budget_type not in ("hourly", "fixed"):
+        raise ValueError(f"Unknown budget type: {budget_type}")
+
+    conn = job_store.get_connection()
+
+    where = ["dim = ?"]
+    params = [dim]
+    if key is not None:
+        where.append("key = ? COLLATE NOCASE")
+        params.append(job_store.normalize_country(key) if dim == "country" else key.lower())
+    if start_day:
+        where.append("day >= ?")
+        params.append(start_day)
+    if end_day:
+        where.append("day <= ?")
+        params.append(end_day)
+    clause = " AND ".join(where)
+
+    # Keep only the busiest keys so a broad query stays small
+    top_keys = [r[0] for r in conn.execute(
+        f"SELECT key FROM rollup_counts WHERE {clause} GROUP BY key ORDER BY SUM(jobs) DESC LIMIT ?",
+        params + [int(limit)],
+    )]
+    if not top_keys:
+        return []
+    key_clause = f"{clause} AND key IN ({','.join('?' * len(top_keys))})"
+    key_params = params + top_keys
+
+    groups = {}
+    for r in conn.execute(f"SELECT * FROM rollup_counts WHERE {key_clause}", key_params):
+        group = (r["key"], r["day"] if by_day else None)
+        agg = groups.setdefault(group, [0, 0, 0.0, 0, 0.0])
+        agg[0] += r["jobs"]
+        agg[1] += r[f"{budget_type}_n"]
+        agg[2] += r[f"{budget_type}_sum"]
+        agg[3] += r["proposals_n"]
+        agg[4] += r["proposals_sum"]
+
+    sketches = defaultdict(lambda: defaultdict(int))
+    for r in conn.execute(
+        f"SELECT key, day, bucket, n FROM rollup_budget_sketch WHERE {key_clause} AND budget_type = ?",
+        key_params + [budget_type],
+    ):
+        sketches[(r["key"], r["day"] if by_day else None)][r["bucket"]] += r["n"]
+
+    results = []
+    for (group_key, day), (jobs, budget_n, budget_sum, proposals_n, proposals_sum) in groups.items():
+        quantiles = _quantiles(sketches.get((group_key, day), {}), (0.5, 0.9))
+        label = budget_type.capitalize()
+        entry = {
+            "key": group_key,
+            "jobs": jobs,
+            f"{budget_type}Jobs": budget_n,
+            f"avg{label}Budget": round(budget_sum / budget_n, 2) if budget_n else None,
+            f"median{label}Budget": quantiles[0.5],
+            f"p90{label}Budget": quantiles[0.9],
+            "avgProposals": round(proposals_sum / proposals_n, 1) if proposals_n else None,
+        }
+        if by_day:
+            entry = {"day": day, **entry}
+        results.append(entry)
+
+    results.sort(key=lambda e: (e.get("day") or "", -e["jobs"]))
+    return results
@@ -0,0 +1,190 @@
+import asyncio
+import heapq
+import itertools
+import os
+import re
+import time
+from collections import deque
+
+import job_store
+import metrics
+
+# Title/description keywords that make a tile worth opening
+PRIORITY_KEYWORDS = [
+    k.strip().lower()
+    for k in os.environ.get("UPWORK_PRIORITY_KEYWORDS", "crm,zoho,automation,integration,api,workflow").split(",")
+    if k.strip()
+]
+PREFERRED_COUNTRIES = {
+    job_store.normalize_country(c)
+    for c in os.environ.get("UPWORK_PREFERRED_COUNTRIES", "USA,Canada,United Kingdom,Australia").split(",")
+    if c.strip()
+}
+
+# Detail pages opened per minute by the background scheduler (0 disables it)
+PAGES_PER_MINUTE = int(os.environ.get("UPWORK_DETAIL_PAGES_PER_MINUTE", "4"))
+# Tiles scoring below this are never opened
+MIN_SCORE = float(os.environ.get("UPWORK_DETAIL_MIN_SCORE", "3"))
+
+
+def score_tile(job):
+    """Cheap priority for a feed tile, from what the tile itself shows. Higher is better."""
+    title = (job.get("title") or "").lower()
+    description = (job.get("description") or "").lower()
+    score = 0.0
+
+    for keyword in PRIORITY_KEYWORDS:
+        if re.search(r"\b" + re.escape(keyword), title):
+            score += 3
+        elif keyword in description:
+            score += 1
+
+    if job_store.normalize_country(job.get("clientCountry")) in PREFERRED_COUNTRIES:
+        score += 1
+
+    low, _ = job_store.parse_proposals(job.get("proposals"))
+    if low is not None:
+        score += 2 if low < 5 else 1 if low < 10 else 0 if low < 20 else -1 if low < 50 else -3
+
+    _, _, budget_max = job_store.parse_budget(job.get("budget"))
+    if budget_max:
+        score += min(budget_max / 50, 2) if "hour" in (job.get("budget") or "").lower() else min(budget_max / 1000, 2)
+
+    # Cached client profile attached by client_cache.annotate_tiles
+    client = job.get("client") or {}
+    if client.get("clientPaymentVerified") is False:
+        score -= 2
+    if client.get("clientRating"):
+        score += (client["clientRating"] - 4) / 2
+    if (client.get("clientHireRate") or "").startswith("0%"):
+        score -= 1
+
+    return round(score, 2)
+
+
+class DetailScheduler:
+    """Priority queue of detail pages to fetch, drained best-first under a per-minute page budget.
+
+    push() can be called at any time; a newly pushed high-scoring job is fetched
+    before older, lower-scoring ones still waiting. Jobs that wait longer than
+    max_wait seconds are dropped, since by then their detail is no longer urgent.
+    """
+
+    def __init__(self, fetch, pages_per_minute=PAGES_PER_MINUTE, min_score=MIN_SCORE,
+                 max_queue=200, max_wait=3600, max_done=5000):
+        self.fetch = fetch
+        self.pages_per_minute = pages_per_minute
+        self.min_score = min_score
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.max_done = max_done
+        self._heap = []  # (-score, seq, job_id)
+        self._entries = {}  # job_id -> (score, discovered_at, job)
+        self._done = {}  # jobIds already fetched, oldest first; a dict as a bounded ordered set
+        self._seq = itertools.count()
+        self._started = deque()  # fetch start times in the last minute
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def push(self, jobs):
+        """Score tiles and queue the promising ones. Returns the number queued."""
+        queued = 0
+        now = time.time()
+        for job in jobs:
+            job_id = job_store.clean(job.get("jobId"))
+            if job_id is None or job_id in self._done:
+                continue
+            score = score_tile(job)
+            if score < self.min_score:
+                continue
+
+            current = self._entries.get(job_id)
+            if current is not None and current[0] >= score:
+                continue
+            # A re-scored job keeps its original discovery time; the stale heap entry is skipped on pop
+            discovered_at = current[1] if current else now
+            self._entries[job_id] = (score, discovered_at, job)
+            heapq.heappush(self._heap, (-score, next(self._seq), job_id))
+            queued += 1
+
+        if len(self._entries) > self.max_queue:
+            self._evict()
+        if queued:
+            self._wakeup.set()
+        return queued
+
+    def _evict(self):
+        """Keep only the best max_queue jobs"""
+        best = heapq.nsmallest(self.max_queue, (e for e in self._heap if self._is_current(e)))
+        keep = {job_id for _, _, job_id in best}
+        self._entries = {k: v for k, v in self._entries.items() if k in keep}
+        self._heap = best
+        heapq.heapify(self._heap)
+
+    def _is_current(self, entry):
+        neg_score, _, job_id = entry
+        current = self._entries.get(job_id)
+        return current is not None and current[0] == -neg_score
+
+    def pop(self):
+        """Best queued job still worth fetching, or None"""
+        now = time.time()
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+            score, discovered_at, job = self._entries.pop(entry[2])
+            if now - discovered_at <= self.max_wait:
+                return score, discovered_at, job
+        return None
+
+    def _budget_wait(self):
+        """Seconds until another page may be opened under the per-minute budget"""
+        now = time.time()
+        while self._started and now - self._started[0] >= 60:
+            self._started.popleft()
+        if len(self._started) < self.pages_per_minute:
+            return 0
+        return 60 - (now - self._started[0])
+
+    async def run(self):
+        """Fetch queued detail pages forever, best first"""
+        while True:
+            if not self._entries:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # Wait for budget before choosing, so anything pushed meanwhile competes for the slot
+            delay = self._budget_wait()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            item = self.pop()
+            if item is None:
+                continue
+            score, discovered_at, job = item
+            self._started.append(time.time())
+            self._done[job["jobId"]] = None
+            while len(self._done) > self.max_done:
+                del self._done[next(iter(self._done))]
+
+            try:
+                await self.fetch(job)
+            except Exception as e:
+                print(f"⚠️  Detail fetch failed for {job['jobId']}: {e}")
+                continue
+            metrics.record_metric("time_to_detail", time.time() - discovered_at, jobId=job["jobId"], score=score)
+
+    def start(self):
+        if self.pages_per_minute > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
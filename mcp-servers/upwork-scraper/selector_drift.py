@@ -0,0 +1,117 @@
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import extractor
+import snapshots
+
+# Known-good pages saved by debug_selectors.py and debug_jobs_details.py
+BASELINES = {
+    "detail": Path(__file__).parent / "job_detail_page.html",
+    "feed": Path(__file__).parent / "page_source.html",
+}
+
+_ATTR_RE = re.compile(r'\s(data-(?:test|qa|testid))="([^"]*)"')
+
+_baseline_cache = {}
+
+
+def page_kind(html):
+    return "detail" if extractor.is_detail_page(html) else "feed"
+
+
+def structure(html, kind=None):
+    """Attribute counts and field selector match counts of one page, read without a browser"""
+    kind = kind or page_kind(html)
+    stripped = extractor._STRIP_RE.sub("", html)
+    attrs = Counter(f'{name}="{value}"' for name, value in _ATTR_RE.findall(stripped))
+
+    root = extractor.parse_html(html)
+    selectors = extractor.DETAIL_SELECTORS if kind == "detail" else extractor.TILE_SELECTORS
+    fields = {field: len(root.select(selector)) for field, selector in selectors.items()}
+    return {"kind": kind, "attrs": attrs, "fields": fields}
+
+
+def baseline_structure(kind, path=None):
+    path = Path(path or BASELINES[kind])
+    key = (kind, str(path))
+    if key not in _baseline_cache:
+        _baseline_cache[key] = structure(snapshots.read_snapshot(path), kind)
+    return _baseline_cache[key]
+
+
+def diff(html, baseline_path=None):
+    """Compare a page against the known-good page of the same kind.
+
+    brokenFields are selectors that matched in the baseline and match nothing
+    now; those are what break extraction. Attribute changes are context.
+    """
+    current = structure(html)
+    baseline = baseline_structure(current["kind"], baseline_path)
+    selectors = extractor.DETAIL_SELECTORS if current["kind"] == "detail" else extractor.TILE_SELECTORS
+
+    return {
+        "kind": current["kind"],
+        "addedAttrs": sorted(set(current["attrs"]) - set(baseline["attrs"])),
+        "removedAttrs": sorted(set(baseline["attrs"]) - set(current["attrs"])),
+        "brokenFields": {
+            field: selectors[field]
+            for field, count in current["fields"].items()
+            if count == 0 and baseline["fields"].get(field)
+        },
+    }
+
+
+def _latest_snapshots():
+    latest = {}
+    for path in snapshots.iter_snapshots():
+        kind = path.parent.name
+        if kind in BASELINES and (kind not in latest or path.stat().st_mtime > latest[kind].stat().st_mtime):
+            latest[kind] = path
+    return list(latest.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report selector drift in saved pages against known-good snapshots")
+    parser.add_argument("pages", nargs="*", help="HTML or .html.gz files (default: latest detail and feed snapshot)")
+    parser.add_argument("--baseline", help="Known-good page to compare against instead of the default for its kind")
+    parser.add_argument("--strict", action="store_true", help="Also fail when data-test/data-qa attributes disappear")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    pages = [Path(p) for p in args.pages] or _latest_snapshots()
+    if not pages:
+        print("❌ No pages to check")
+        return 2
+
+    failed = False
+    reports = {}
+    for path in pages:
+        started = time.time()
+        report = diff(snapshots.read_snapshot(path), args.baseline)
+        report["seconds"] = round(time.time() - started, 3)
+        reports[str(path)] = report
+        failed = failed or bool(report["brokenFields"]) or (args.strict and bool(report["removedAttrs"]))
+
+        if args.json:
+            continue
+        status = "❌" if report["brokenFields"] else "✅"
+        print(f"{status} {path} ({report['kind']}, {report['seconds']}s)")
+        for field, selector in report["brokenFields"].items():
+            print(f"   ✗ {field}: {selector} no longer matches")
+        for attr in report["removedAttrs"]:
+            print(f"   - {attr}")
+        for attr in report["addedAttrs"]:
+            print(f"   + {attr}")
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
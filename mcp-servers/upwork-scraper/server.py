@@ -1,11 +1,29 @@
 import asyncio
+import contextlib
+import importlib
 import os
+import sys
+import time
 from pathlib import Path
 from mcp.server import Server
 from mcp.types import Tool, TextContent
-from playwright.async_api import async_playwright
 from dotenv import load_dotenv
 import json
+import alerts
+import client_cache
+import competition
+import extractor
+import job_details
+import job_store
+import live_feed
+import models
+import rate_limiter
+import review_index
+import rollups
+import scheduler
+import session
+import summarizer
+import watchdog
 
 # Load environment variables
 load_dotenv()
@@ -17,54 +35,125 @@ app = Server("upwork-scraper")
 browser_context = None
 page = None
 playwright_instance = None
+upwork_session = None  # SessionManager when running headless from a saved login
 
-async def init_browser():
+# Guards browser startup so the background pre-warm and the first tool call
+# never launch two browsers
+browser_lock = asyncio.Lock()
+
+# Set by the pre-warm once the feed has rendered, so the first scrape can skip its settle wait
+feed_ready = False
+prewarm_task = None
+
+# Opens the detail pages of the most promising tiles in the background
+detail_scheduler = None
+
+# One scrape at a time on the shared feed page (tool calls and the feed watcher)
+scrape_lock = asyncio.Lock()
+watch_task = None
+background_tasks = set()
+
+# Jobs seen by this server, most recent last, as compact Job records
+job_cache = models.JobCache()
+
+# Tiles pushed from the feed page by a MutationObserver, when the live feed is on
+feed_watcher = None
+
+# Replaces pages (and now and then the whole context) whose JS heap or DOM has grown too large
+browser_watchdog = watchdog.Watchdog()
+
+FEED_URL = "https://www.upwork.com/nx/find-work/best-matches"
+# The feed's job tiles, as chrome_connect.py and the extractor see them
+JOB_TILE_SELECTOR = extractor.TILE_SELECTORS["tile"]
+
+async def init_browser(interactive=True):
     """Initialize browser using your real Chrome profile"""
-    global browser_context, page, playwright_instance
+    async with browser_lock:
+        if browser_context is not None:
+            return  # Already initialized
+        
+        try:
+            await launch_browser(interactive)
+        except BaseException:
+            await shutdown_browser()
+            raise
+        
+        if live_feed.LIVE_FEED_ENABLED:
+            await start_live_feed()
+
+async def shutdown_browser():
+    """Stop whatever a failed launch left running, so the next attempt starts clean"""
+    global browser_context, page, playwright_instance, upwork_session
     
-    if browser_context is not None:
-        return  # Already initialized
+    try:
+        if upwork_session is not None:
+            await upwork_session.close()
+        elif browser_context is not None:
+            await browser_context.close()
+        if playwright_instance is not None:
+            await playwright_instance.stop()
+    except Exception as e:
+        print(f"⚠️  Browser shutdown failed: {e}")
+    finally:
+        browser_context = None
+        page = None
+        playwright_instance = None
+        upwork_session = None
+
+async def start_live_feed():
+    """Have the feed page push new and changed tiles instead of re-reading them all"""
+    global feed_watcher
     
-    playwright_instance = await async_playwright().start()
+    try:
+        watcher = live_feed.LiveFeed(process_jobs)
+        await watcher.attach(page)
+        feed_watcher = watcher
+    except Exception as e:
+        print(f"⚠️  Live feed unavailable, falling back to full scrapes: {e}")
+
+async def launch_browser(interactive):
+    """Start Playwright and open the job feed in your Chrome profile"""
+    global browser_context, page, playwright_instance, upwork_session
     
-    # Find your Chrome executable
-    # Common locations on Windows:
-    chrome_paths = [
-        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe")
-    ]
+    # Playwright is imported here rather than at module load so the MCP server
+    # can answer list_tools straight away. The import runs in a worker thread
+    # so it doesn't stall the event loop while the pre-warm is in progress.
+    playwright_api = await asyncio.to_thread(importlib.import_module, "playwright.async_api")
+    playwright_instance = await playwright_api.async_playwright().start()
     
-    chrome_exe = None
-    for path in chrome_paths:
-        if os.path.exists(path):
-            chrome_exe = path
-            break
+    # Once a login has been captured with `python session.py`, run headless
+    # from it. UPWORK_HEADLESS=0 keeps using your visible Chrome profile.
+    if os.environ.get("UPWORK_HEADLESS", "1") != "0" and session.has_storage_state():
+        # stdin is the MCP pipe, so an expired login is reported, never prompted for
+        upwork_session = session.SessionManager(playwright_instance, interactive=False)
+        await upwork_session.start()
+        browser_context = upwork_session.context
+        page = await browser_context.new_page()
+        
+        print("🔍 Navigating to Upwork job feed...")
+        await rate_limiter.polite_goto(page, FEED_URL, 
+                                       wait_until="domcontentloaded",
+                                       timeout=30000)
+        
+        await ensure_logged_in()
+        
+        print(f"✅ Browser ready. Current URL: {page.url}")
+        return
     
-    if not chrome_exe:
-        raise Exception("Could not find Chrome installation. Please install Google Chrome.")
+    options = chrome_launch_options()
     
-    # Your Chrome profile location
-    user_data_dir = os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\User Data")
+    # Opening the real profile while Chrome is running fails or corrupts it, so
+    # only a tool call, where the user can confirm, may launch it
+    if not interactive:
+        raise RuntimeError("Chrome profile mode launches on the first tool call, after Chrome is closed")
     
     print(f"🌐 Launching your Chrome browser...")
-    print(f"📁 Using profile from: {user_data_dir}")
+    print(f"📁 Using profile from: {options['user_data_dir']}")
     print("\n⚠️  IMPORTANT: Close ALL Chrome windows before continuing!")
     input("Press ENTER when all Chrome windows are closed: ")
     
     # Launch Chrome with your profile
-    browser_context = await playwright_instance.chromium.launch_persistent_context(
-        user_data_dir=user_data_dir,
-        executable_path=chrome_exe,
-        headless=False,
-        channel=None,  # Use the executable path instead of channel
-        args=[
-            '--disable-blink-features=AutomationControlled',
-            '--no-first-run',
-            '--no-default-browser-check'
-        ],
-        viewport={'width': 1920, 'height': 1080}
-    )
+    browser_context = await playwright_instance.chromium.launch_persistent_context(**options)
     
     # Get or create page
     if len(browser_context.pages) > 0:
@@ -74,15 +163,15 @@ async def init_browser():
     
     # Navigate to Upwork job feed
     print("🔍 Navigating to Upwork job feed...")
-    await page.goto("https://www.upwork.com/nx/find-work/best-matches", 
-                    wait_until="domcontentloaded",
-                    timeout=30000)
+    await rate_limiter.polite_goto(page, FEED_URL, 
+                                   wait_until="domcontentloaded",
+                                   timeout=30000)
     
     await asyncio.sleep(3)
     
     current_url = page.url
     
-    if "login" in current_url or "account-security" in current_url:
+    if session.is_auth_redirect(current_url):
         print("\n" + "="*60)
         print("⚠️  Please log in manually in the browser window")
         print("="*60)
@@ -91,109 +180,487 @@ async def init_browser():
         print("✅ Already logged in!")
     
     print(f"✅ Browser ready. Current URL: {page.url}")
-async def scrape_jobs():
-    """Scrape job postings from Upwork feed"""
-    global page
+
+def chrome_launch_options():
+    """Persistent-context options for your installed Chrome and its profile"""
+    # Find your Chrome executable
+    # Common locations on Windows:
+    chrome_paths = [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe")
+    ]
     
-    await init_browser()
+    chrome_exe = None
+    for path in chrome_paths:
+        if os.path.exists(path):
+            chrome_exe = path
+            break
     
-    # Make sure we're on the job feed
+    if not chrome_exe:
+        raise Exception("Could not find Chrome installation. Please install Google Chrome.")
+    
+    return {
+        # Your Chrome profile location
+        "user_data_dir": os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\User Data"),
+        "executable_path": chrome_exe,
+        "headless": False,
+        "channel": None,  # Use the executable path instead of channel
+        "args": [
+            '--disable-blink-features=AutomationControlled',
+            '--no-first-run',
+            '--no-default-browser-check'
+        ],
+        "viewport": {'width': 1920, 'height': 1080}
+    }
+
+async def recycle_if_needed():
+    """Between tool calls, replace the feed page or the whole context once it has grown too large"""
+    if browser_context is None or not browser_watchdog.due():
+        return
+    
+    over = await browser_watchdog.check(browser_context.pages)
+    feed_sample = next((sample for p, sample in over if p is page), None)
+    if feed_sample is None:
+        return  # Detail tabs are short-lived and close themselves
+    
+    async with scrape_lock:
+        # Only swap the context when no detail fetch has a tab open in it
+        if browser_watchdog.context_due() and len(browser_context.pages) <= 1:
+            await recycle_context()
+            browser_watchdog.recycled("context", feed_sample)
+        else:
+            await recycle_page()
+            browser_watchdog.recycled("page", feed_sample)
+    print(f"♻️  Recycled the browser after the feed reached {feed_sample['jsHeapMb']:.0f} MB heap, {feed_sample['domNodes']} DOM nodes")
+
+async def recycle_page():
+    """Swap the feed page for a fresh tab; the next scrape loads the feed into it"""
+    global page, feed_ready
+    
+    old_page = page
+    page = await browser_context.new_page()
+    await old_page.close()
+    feed_ready = False
+    if feed_watcher is not None:
+        await feed_watcher.attach(page)
+
+async def recycle_context():
+    """Replace the browser context, keeping the login"""
+    global browser_context, page, feed_ready
+    
+    async with browser_lock:
+        old_context = browser_context
+        if upwork_session is not None:
+            # Carry the current cookies over through the saved storage state
+            await upwork_session.save(old_context)
+            browser_context = await upwork_session.new_context()
+            upwork_session.context = browser_context
+            await old_context.close()
+        else:
+            # The Chrome profile keeps the login on disk; it can only be opened once, so close first
+            await old_context.close()
+            browser_context = await playwright_instance.chromium.launch_persistent_context(**chrome_launch_options())
+        
+        page = browser_context.pages[0] if browser_context.pages else await browser_context.new_page()
+        feed_ready = False
+        if feed_watcher is not None:
+            await feed_watcher.attach(page)
+
+async def prewarm():
+    """Launch the browser and render the job feed in the background at startup"""
+    global feed_ready
+    
+    try:
+        await init_browser(interactive=False)
+        await page.wait_for_selector(JOB_TILE_SELECTOR, timeout=30000)
+        feed_ready = True
+        print("🔥 Pre-warm complete, job feed is ready")
+    except Exception as e:
+        # Not fatal: the first tool call will finish the startup itself
+        print(f"⚠️  Pre-warm did not finish: {e}")
+
+async def ensure_logged_in():
+    """Raise LoginRequiredError if the page was bounced to a login screen"""
+    if not session.is_auth_redirect(page.url):
+        return
+    if upwork_session is None:
+        raise session.LoginRequiredError("Upwork asked for a login. Log in in the Chrome window, then retry.")
+    # Picks up a login saved with `python session.py` since the browser started
+    await upwork_session.ensure_authenticated(page)
+
+async def open_feed(refresh=False, interactive=True):
+    """Make sure the page shows a loaded job feed, reloading it if asked.
+    
+    An expired login raises LoginRequiredError; the server never prompts for one.
+    """
+    global feed_ready
+    
+    await init_browser(interactive)
+    
+    await ensure_logged_in()
     current_url = page.url
+    
+    # Make sure we're on the job feed
     if "find-work" not in current_url:
         print("🔄 Navigating to job feed...")
-        await page.goto("https://www.upwork.com/nx/find-work/best-matches", 
-                       wait_until="domcontentloaded",
-                       timeout=30000)
+        await rate_limiter.polite_goto(page, FEED_URL, 
+                                       wait_until="domcontentloaded",
+                                       timeout=30000)
         await asyncio.sleep(3)
+    elif refresh:
+        await rate_limiter.polite_goto(page, FEED_URL, 
+                                       wait_until="domcontentloaded",
+                                       timeout=30000)
+    elif feed_ready:
+        print("✅ Job feed pre-warmed")
+        feed_ready = False
     else:
         print("✅ Already on job feed")
         await asyncio.sleep(2)  # Brief wait for any dynamic content
     
+    # An expired saved session shows up as a redirect to the login page
+    await ensure_logged_in()
+    
     # Try to find job tiles
     try:
-        await page.wait_for_selector('[data-test="JobTile"]', timeout=10000)
+        await page.wait_for_selector(JOB_TILE_SELECTOR, timeout=10000)
         print("✅ Job tiles found!")
     except Exception as e:
+        # A challenge served in place of the feed would otherwise look like an empty feed
+        reason = await rate_limiter.detect_block(page)
+        if reason is not None:
+            await rate_limiter.limiter.on_block()
+            raise rate_limiter.BlockedError(reason)
         print(f"⚠️  Could not find job tiles: {e}")
         print(f"Current URL: {page.url}")
         print("The page might not have loaded properly or selectors changed.")
+
+async def scrape_jobs(refresh=False, interactive=True):
+    """Scrape job postings from Upwork feed"""
+    await open_feed(refresh, interactive)
     
-    # Extract job data
-    jobs = await page.evaluate(r"""
-        () => {
-            const jobTiles = document.querySelectorAll('[data-test="JobTile"]');
-            const jobs = [];
-            
-            console.log('Found', jobTiles.length, 'job tiles');
-            
-            jobTiles.forEach(tile => {
-                try {
-                    const titleElement = tile.querySelector('[data-test="UpLink"]');
-                    const title = titleElement ? titleElement.innerText : 'N/A';
-                    const jobUrl = titleElement ? titleElement.href : '';
-                    
-                    const jobIdMatch = jobUrl.match(/jobs\/(~[a-f0-9]+)/);
-                    const jobId = jobIdMatch ? jobIdMatch[1] : 'N/A';
-                    
-                    const descElement = tile.querySelector('[data-test="job-description-text"]');
-                    const description = descElement ? descElement.innerText : 'N/A';
-                    
-                    const budgetElement = tile.querySelector('[data-test="budget"]');
-                    const budget = budgetElement ? budgetElement.innerText : 'N/A';
-                    
-                    const postedElement = tile.querySelector('[data-test="job-pubilshed-date"]');
-                    const posted = postedElement ? postedElement.innerText : 'N/A';
-                    
-                    jobs.push({
-                        jobId: jobId,
-                        title: title,
-                        description: description,
-                        budget: budget,
-                        posted: posted,
-                        url: jobUrl
-                    });
-                } catch (e) {
-                    console.error('Error parsing job tile:', e);
-                }
-            });
-            
-            return jobs;
-        }
-    """)
+    # Same tile reader as the live feed observer
+    jobs = await page.evaluate(live_feed.READ_TILES_SCRIPT)
     
     return jobs
 
+async def fetch_detail(job):
+    """Scheduler callback: fetch one job's detail page in its own tab"""
+    await job_details.fetch_job_detail(browser_context, job_id=job["jobId"], url=job.get("url"))
+
+def queue_details(jobs):
+    """Queue the detail pages of promising tiles, best first"""
+    global detail_scheduler
+    
+    if scheduler.PAGES_PER_MINUTE <= 0:
+        return
+    if detail_scheduler is None:
+        detail_scheduler = scheduler.DetailScheduler(fetch_detail)
+    queued = detail_scheduler.push(jobs)
+    detail_scheduler.start()
+    if queued:
+        print(f"📋 Queued {queued} job detail pages ({len(detail_scheduler)} waiting)")
+
+async def collect_jobs(refresh=False, interactive=True):
+    """Current feed jobs, after passing them to the store, client cache, detail queue and alerts"""
+    if feed_watcher is not None:
+        # Tiles arrive through process_jobs as the page renders them
+        async with scrape_lock:
+            await open_feed(refresh, interactive)
+            await asyncio.sleep(0.3)  # let the observer's last batch land
+        return feed_watcher.snapshot()
+    
+    async with scrape_lock:
+        scraped = await scrape_jobs(refresh, interactive)
+    jobs = [models.Job.from_dict(job) for job in scraped]
+    await process_jobs(jobs, time.time())
+    return jobs
+
+async def process_jobs(jobs, discovered_at):
+    """Store new or changed jobs and pass them to the client cache, detail queue and alerts"""
+    job_cache.put(jobs)
+    
+    new_ids = job_store.save_jobs(jobs, discovered_at)
+    client_cache.annotate_tiles(jobs)
+    queue_details(jobs)
+    
+    # Alerts go out in the background so a tool call never waits on a webhook
+    task = asyncio.create_task(alerts.dispatch(jobs, new_ids, discovered_at))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def watch_feed():
+    """Reload the feed on a timer so matching jobs are alerted without a tool call"""
+    while True:
+        try:
+            # Nobody is at the keyboard here, and stdin is the MCP pipe, so never prompt
+            await collect_jobs(refresh=True, interactive=False)
+        except rate_limiter.BlockedError:
+            pass  # The limiter holds every page load until its cooldown is over
+        except session.LoginRequiredError as e:
+            print(f"🔐 Skipping feed checks: {e}", file=sys.stderr)
+        except Exception as e:
+            print(f"⚠️  Feed check failed: {e}")
+        await asyncio.sleep(alerts.POLL_SECONDS)
+        await check_browser_memory()
+
 # Register the MCP tool
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     return [
         Tool(
             name="upwork_get_jobs",
-            description="Fetches recent job postings from your Upwork feed. Returns job titles, descriptions, budgets, URLs, and unique job IDs.",
+            description="Fetches recent job postings from your Upwork feed. Returns job titles, budgets, URLs, and unique job IDs, plus cached client details (rating, spend, hires) when the client has been seen before. Descriptions are condensed to key sentences, detected skills, deliverables and budget hints unless full_text is set.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "full_text": {"type": "boolean", "default": False, "description": "Return full descriptions instead of digests"}
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="upwork_search_jobs",
+            description="Full-text search over every job scraped so far (title, description, skills, client). Results are ranked by relevance and can be filtered by budget, client country and posting date.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Words to search for, e.g. 'zoho crm automation'"},
+                    "min_budget": {"type": "number", "description": "Minimum budget in USD (hourly rate for hourly jobs)"},
+                    "max_budget": {"type": "number", "description": "Maximum budget in USD (hourly rate for hourly jobs)"},
+                    "budget_type": {"type": "string", "enum": ["hourly", "fixed"]},
+                    "country": {"type": "string", "description": "Client country, e.g. 'USA'"},
+                    "posted_after": {"type": "string", "description": "Earliest posting date, YYYY-MM-DD"},
+                    "posted_before": {"type": "string", "description": "Latest posting date, YYYY-MM-DD"},
+                    "limit": {"type": "integer", "default": 20}
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="upwork_job_stats",
+            description="Reporting over the job history: jobs per skill/country/day, average, median and p90 budget, and average proposal competition. Served from pre-aggregated rollups, so it is fast regardless of how much history is stored.",
             inputSchema={
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "dim": {"type": "string", "enum": ["all", "country", "skill"], "default": "all", "description": "What to group by"},
+                    "key": {"type": "string", "description": "Only this country or skill, e.g. 'USA' or 'zoho crm'"},
+                    "start_day": {"type": "string", "description": "First day to include, YYYY-MM-DD"},
+                    "end_day": {"type": "string", "description": "Last day to include, YYYY-MM-DD"},
+                    "budget_type": {"type": "string", "enum": ["hourly", "fixed"], "default": "hourly"},
+                    "by_day": {"type": "boolean", "default": True, "description": "One row per day instead of totals over the range"},
+                    "limit": {"type": "integer", "default": 20, "description": "Maximum number of countries/skills to return"}
+                },
                 "required": []
             }
+        ),
+        Tool(
+            name="upwork_job_competition",
+            description="How fast jobs are filling up with proposals, from the history recorded every time a job is re-scraped. Pass jobIds to get each job's proposal history and rate; omit them to list recent jobs that are still uncrowded.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jobIds": {"type": "array", "items": {"type": "string"}, "description": "Jobs to report on, e.g. ['~021989774412036501954']"},
+                    "max_proposals": {"type": "integer", "default": 10, "description": "Uncrowded list: most proposals a job may have"},
+                    "max_age_hours": {"type": "number", "default": 48, "description": "Uncrowded list: only jobs posted this recently"},
+                    "limit": {"type": "integer", "default": 20}
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="upwork_get_job_details",
+            description="Full details of several jobs in one call: description, deliverables, skills, budget, activity (proposals, interviewing, invites) and client history. Takes jobIds or job URLs, fetches them concurrently, serves recently fetched jobs from the local store, and returns whatever finished if the timeout is reached.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jobIds": {"type": "array", "items": {"type": "string"}, "description": "jobIds (e.g. '~021989774412036501954') or job URLs"},
+                    "max_age_hours": {"type": "number", "default": 24, "description": "Reuse stored details fetched within this many hours"},
+                    "timeout_seconds": {"type": "number", "default": 90, "description": "Return partial results after this long"},
+                    "full_text": {"type": "boolean", "default": False, "description": "Return full descriptions instead of digests"}
+                },
+                "required": ["jobIds"]
+            }
+        ),
+        Tool(
+            name="upwork_check_reviewed",
+            description="Has this job already been reviewed? Checks many jobIds at once against the local review index (no CRM call) and returns the status (skipped, applied, in_crm), reason and time for the reviewed ones.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jobIds": {"type": "array", "items": {"type": "string"}, "description": "jobIds to check, e.g. ['~021989774412036501954']"}
+                },
+                "required": ["jobIds"]
+            }
+        ),
+        Tool(
+            name="upwork_mark_reviewed",
+            description="Record a review decision for one or more jobs so they are not reviewed again. The decision is synced to the CRM in the background when a CRM connector is configured.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jobIds": {"type": "array", "items": {"type": "string"}},
+                    "status": {"type": "string", "enum": list(review_index.STATUSES), "description": "'new' clears an earlier decision"},
+                    "reason": {"type": "string", "description": "Why, e.g. 'budget too low'"}
+                },
+                "required": ["jobIds", "status"]
+            }
         )
     ]
 
+async def check_browser_memory():
+    try:
+        await recycle_if_needed()
+    except Exception as e:
+        # Never fail a tool call over the watchdog
+        print(f"⚠️  Browser watchdog failed: {e}")
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    await check_browser_memory()
+    
     if name == "upwork_get_jobs":
-        jobs = await scrape_jobs()
+        try:
+            jobs = await collect_jobs()
+        except session.LoginRequiredError as e:
+            return [TextContent(type="text", text=json.dumps({"error": str(e)}, indent=2))]
+        except rate_limiter.BlockedError as e:
+            return [TextContent(
+                type="text",
+                text=json.dumps({
+                    "error": f"Upwork is rate limiting or challenging the browser ({e}). Try again later.",
+                    "rateLimit": await rate_limiter.limiter.status(),
+                }, indent=2)
+            )]
+        
+        jobs = [job.to_dict() for job in jobs]
+        if not arguments.get("full_text"):
+            jobs = summarizer.compact_jobs(jobs)
         
         return [TextContent(
             type="text",
             text=json.dumps(jobs, indent=2)
         )]
     
+    if name == "upwork_search_jobs":
+        results = job_store.search_jobs(**arguments)
+        
+        return [TextContent(
+            type="text",
+            text=json.dumps(results, indent=2)
+        )]
+    
+    if name == "upwork_job_stats":
+        stats = rollups.query_rollup(**arguments)
+        
+        return [TextContent(
+            type="text",
+            text=json.dumps(stats, indent=2)
+        )]
+    
+    if name == "upwork_job_competition":
+        if arguments.get("jobIds"):
+            result = [competition.fill_rate(job_id) for job_id in arguments["jobIds"]]
+        else:
+            result = competition.uncrowded_jobs(
+                arguments.get("max_proposals", 10),
+                arguments.get("max_age_hours", 48),
+                arguments.get("limit", 20)
+            )
+        
+        return [TextContent(
+            type="text",
+            text=json.dumps(result, indent=2)
+        )]
+    
+    if name == "upwork_get_job_details":
+        progress_token = None
+        context = app.request_context
+        if context.meta is not None:
+            progress_token = context.meta.progressToken
+        
+        async def report_progress(done, total):
+            if progress_token is not None:
+                await context.session.send_progress_notification(
+                    progress_token=progress_token, progress=done, total=total
+                )
+        
+        async def get_context():
+            await init_browser()
+            return browser_context
+        
+        targets = arguments["jobIds"]
+        known_urls = {}
+        for target in targets:
+            job = job_cache.get(job_details.job_id_of(target))
+            if job is not None and job.url:
+                known_urls[job.jobId] = job.url
+        
+        results = await job_details.fetch_many(
+            get_context,
+            targets,
+            max_age=arguments.get("max_age_hours", 24) * 3600,
+            timeout=arguments.get("timeout_seconds", 90),
+            on_progress=report_progress,
+            known_urls=known_urls
+        )
+        
+        if not arguments.get("full_text"):
+            fetched = [r for r in results if "detail" in r]
+            for result, detail in zip(fetched, summarizer.compact_jobs([r["detail"] for r in fetched])):
+                result["detail"] = detail
+        
+        return [TextContent(
+            type="text",
+            text=json.dumps(results, indent=2)
+        )]
+    
+    if name == "upwork_check_reviewed":
+        job_ids = arguments["jobIds"]
+        reviewed = review_index.check_reviewed(job_ids)
+        
+        return [TextContent(
+            type="text",
+            text=json.dumps({
+                "reviewed": reviewed,
+                "notReviewed": [job_id for job_id in job_ids if job_id not in reviewed]
+            }, indent=2)
+        )]
+    
+    if name == "upwork_mark_reviewed":
+        try:
+            marked = review_index.mark_reviewed(arguments["jobIds"], arguments["status"], arguments.get("reason"))
+        except ValueError as e:
+            return [TextContent(type="text", text=json.dumps({"error": str(e)}, indent=2))]
+        
+        return [TextContent(
+            type="text",
+            text=json.dumps({"marked": marked, "status": arguments["status"]}, indent=2)
+        )]
+    
     raise ValueError(f"Unknown tool: {name}")
 
 async def main():
+    global prewarm_task, watch_task
     from mcp.server.stdio import stdio_server
     
-    async with stdio_server() as (read_stream, write_stream):
+    # stdio_server takes the real stdout for MCP messages; every progress print
+    # after that, from any module, goes to stderr so it can't corrupt the protocol
+    async with stdio_server() as (read_stream, write_stream), contextlib.redirect_stdout(sys.stderr):
+        # Warm the browser while Claude Desktop is still listing tools.
+        # Set UPWORK_PREWARM=0 to launch only on the first tool call.
+        if os.environ.get("UPWORK_PREWARM", "1") != "0":
+            prewarm_task = asyncio.create_task(prewarm())
+        
+        # With alert criteria configured, keep checking the feed in the background
+        if alerts.load_criteria() and alerts.POLL_SECONDS > 0:
+            watch_task = asyncio.create_task(watch_feed())
+        
+        # Review marks reach the CRM in the background once a connector sets the hook
+        if review_index.crm_hook is not None:
+            background_tasks.add(asyncio.create_task(review_index.sync_loop()))
+        
         await app.run(
             read_stream,
             write_stream,
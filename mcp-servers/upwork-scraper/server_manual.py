@@ -5,6 +5,7 @@ from mcp.types import Tool, TextContent
 from playwright.async_api import async_playwright
 from dotenv import load_dotenv
 import json
+import rate_limiter
 
 load_dotenv()
 
@@ -49,7 +50,7 @@ async def init_browser():
         
         # Navigate if not already on job feed
         if "find-work" not in page.url:
-            await page.goto("https://www.upwork.com/nx/find-work/best-matches")
+            await rate_limiter.polite_goto(page, "https://www.upwork.com/nx/find-work/best-matches")
             await asyncio.sleep(2)
             
     except Exception as e:
@@ -67,7 +68,7 @@ async def scrape_jobs():
     
     # Make sure on job feed
     if "find-work" not in page.url:
-        await page.goto("https://www.upwork.com/nx/find-work/best-matches")
+        await rate_limiter.polite_goto(page, "https://www.upwork.com/nx/find-work/best-matches")
         await asyncio.sleep(3)
     
     # Extract jobs
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import rate_limiter
+
+# Cookies + localStorage captured from one manual login. Treat it like a password.
+STORAGE_STATE_PATH = os.environ.get(
+    "UPWORK_STORAGE_STATE", str(Path(__file__).parent / "storage_state.json")
+)
+
+LOGIN_URL = "https://www.upwork.com/ab/account-security/login"
+FEED_URL = "https://www.upwork.com/nx/find-work/best-matches"
+
+# Headless Chrome advertises itself as "HeadlessChrome" in its user agent, which
+# Cloudflare flags, so every context presents a regular desktop Chrome instead.
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+VIEWPORT = {'width': 1920, 'height': 1080}
+BROWSER_ARGS = ['--disable-blink-features=AutomationControlled']
+
+
+class LoginRequiredError(Exception):
+    """The Upwork session has expired and there is nobody at the keyboard to log in again"""
+
+    def __init__(self, message="The saved Upwork login has expired. Run `python session.py` to log in again, then retry."):
+        super().__init__(message)
+
+
+def is_auth_redirect(url):
+    """True when Upwork has bounced us to a login / account-security page"""
+    return "login" in url or "account-security" in url
+
+
+def has_storage_state():
+    """True once a manual login has been captured"""
+    return Path(STORAGE_STATE_PATH).exists()
+
+
+async def capture_storage_state(playwright):
+    """Open a visible browser, let the user log in by hand, and save the session"""
+    print("🚀 Launching browser for manual login...")
+    browser = await playwright.chromium.launch(headless=False, args=BROWSER_ARGS)
+    context = await browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
+    page = await context.new_page()
+
+    try:
+        await page.goto(LOGIN_URL, timeout=30000)
+    except Exception as e:
+        print(f"⚠️  Could not load login page automatically: {e}")
+        print("Browser is open - please navigate to Upwork manually")
+
+    print("\n" + "="*60)
+    print("⚠️  MANUAL LOGIN")
+    print("="*60)
+    print("1. Complete login (solve Cloudflare if needed)")
+    print("2. Wait until your job feed is visible")
+    print("="*60 + "\n")
+    input("Press ENTER when you're logged in and see job listings: ")
+
+    await context.storage_state(path=STORAGE_STATE_PATH)
+    await browser.close()
+    print(f"💾 Session saved to {STORAGE_STATE_PATH}")
+
+
+class SessionManager:
+    """Runs headless contexts from the saved login and asks for a new login only when it expires.
+
+    With interactive=False (the MCP server, where stdin is the protocol pipe) an
+    expired login raises LoginRequiredError instead of prompting, unless a newer
+    login has been saved by `python session.py` in the meantime.
+    """
+
+    def __init__(self, playwright, interactive=True):
+        self.playwright = playwright
+        self.interactive = interactive
+        self.browser = None
+        self.context = None
+        self.loaded_at = 0
+
+    async def start(self):
+        """Launch headless Chromium and open the main context from the saved session"""
+        if not has_storage_state():
+            if not self.interactive:
+                raise LoginRequiredError()
+            await capture_storage_state(self.playwright)
+
+        self.browser = await self.playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+        self.loaded_at = os.path.getmtime(STORAGE_STATE_PATH)
+        self.context = await self.new_context()
+        print("🕶️  Headless session started from saved login")
+
+    async def new_context(self):
+        """Open another isolated headless context sharing the saved login"""
+        return await self.browser.new_context(
+            storage_state=STORAGE_STATE_PATH,
+            viewport=VIEWPORT,
+            user_agent=USER_AGENT
+        )
+
+    async def save(self, context=None):
+        """Write refreshed cookies back so the saved session stays current"""
+        await (context or self.context).storage_state(path=STORAGE_STATE_PATH)
+        self.loaded_at = os.path.getmtime(STORAGE_STATE_PATH)
+
+    async def reauthenticate(self):
+        """Capture a fresh login and hand its cookies to every open context"""
+        if self.interactive:
+            print("🔐 Saved Upwork session has expired, a new manual login is needed")
+            await capture_storage_state(self.playwright)
+        elif os.path.getmtime(STORAGE_STATE_PATH) <= self.loaded_at:
+            raise LoginRequiredError()
+
+        self.loaded_at = os.path.getmtime(STORAGE_STATE_PATH)
+        with open(STORAGE_STATE_PATH, encoding='utf-8') as f:
+            cookies = json.load(f).get("cookies", [])
+        for context in self.browser.contexts:
+            await context.clear_cookies()
+            await context.add_cookies(cookies)
+
+    async def ensure_authenticated(self, page, url=FEED_URL):
+        """Re-login if the page was redirected to a login screen, then reload the target"""
+        if not is_auth_redirect(page.url):
+            return
+        await self.reauthenticate()
+        await rate_limiter.polite_goto(page, url, wait_until="domcontentloaded", timeout=30000)
+        if not self.interactive and is_auth_redirect(page.url):
+            raise LoginRequiredError()
+
+    async def close(self):
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+            self.context = None
+
+
+async def main():
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        await capture_storage_state(p)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
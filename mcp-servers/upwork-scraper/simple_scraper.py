@@ -1,39 +1,59 @@
 import asyncio
 from playwright.async_api import async_playwright
-import json
+import rate_limiter
+import session
+from ndjson_sink import NdjsonSink
 
 async def manual_scrape():
     """Simple scraper that you control entirely"""
     
     async with async_playwright() as p:
-        # Launch a regular browser
-        print("🚀 Launching browser...")
-        browser = await p.chromium.launch(headless=False, slow_mo=500)
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
-        page = await context.new_page()
+        manager = None
         
-        print("🌐 Navigating to Upwork...")
-        try:
-            await page.goto("https://www.upwork.com/ab/account-security/login", timeout=30000)
-        except Exception as e:
-            print(f"⚠️  Could not load login page automatically: {e}")
-            print("Browser is open - please navigate to Upwork manually")
-        
-        print("\n" + "="*60)
-        print("⚠️  MANUAL LOGIN")
-        print("="*60)
-        print("\nPlease do the following in the browser:")
-        print("1. Complete login (solve Cloudflare if needed)")
-        print("2. Navigate to your job feed at:")
-        print("   https://www.upwork.com/nx/find-work/best-matches")
-        print("3. Make sure jobs are visible on screen")
-        print("\nWhen ready to scrape, press ENTER here...")
-        print("="*60 + "\n")
-        
-        input("Press ENTER when you're logged in and see job listings: ")
+        if session.has_storage_state():
+            # Reuse the saved login and stay headless
+            manager = session.SessionManager(p)
+            await manager.start()
+            browser = manager.browser
+            context = manager.context
+            page = await context.new_page()
+            
+            print("🌐 Navigating to Upwork job feed...")
+            await rate_limiter.polite_goto(page, session.FEED_URL, timeout=30000)
+            await manager.ensure_authenticated(page)
+        else:
+            # Launch a regular browser
+            print("🚀 Launching browser...")
+            browser = await p.chromium.launch(headless=False, slow_mo=500)
+            context = await browser.new_context(
+                viewport=session.VIEWPORT,
+                user_agent=session.USER_AGENT
+            )
+            page = await context.new_page()
+            
+            print("🌐 Navigating to Upwork...")
+            try:
+                await page.goto(session.LOGIN_URL, timeout=30000)
+            except Exception as e:
+                print(f"⚠️  Could not load login page automatically: {e}")
+                print("Browser is open - please navigate to Upwork manually")
+            
+            print("\n" + "="*60)
+            print("⚠️  MANUAL LOGIN")
+            print("="*60)
+            print("\nPlease do the following in the browser:")
+            print("1. Complete login (solve Cloudflare if needed)")
+            print("2. Navigate to your job feed at:")
+            print("   https://www.upwork.com/nx/find-work/best-matches")
+            print("3. Make sure jobs are visible on screen")
+            print("\nWhen ready to scrape, press ENTER here...")
+            print("="*60 + "\n")
+            
+            input("Press ENTER when you're logged in and see job listings: ")
+            
+            # Save the login so the next run can go headless
+            await context.storage_state(path=session.STORAGE_STATE_PATH)
+            print(f"💾 Login saved to {session.STORAGE_STATE_PATH}, next run will be headless")
         
         # Get current URL
         current_url = page.url
@@ -43,7 +63,7 @@ async def manual_scrape():
         if "find-work" not in current_url:
             print("🔄 Attempting to navigate to job feed...")
             try:
-                await page.goto("https://www.upwork.com/nx/find-work/best-matches", timeout=15000)
+                await rate_limiter.polite_goto(page, session.FEED_URL, timeout=15000)
                 await asyncio.sleep(3)
             except Exception as e:
                 print(f"⚠️  Navigation failed: {e}")
@@ -130,10 +150,10 @@ async def manual_scrape():
                 print(f"URL: {job['url'][:80]}...")
                 print("-" * 60)
             
-            # Save to file
-            with open('scraped_jobs.json', 'w', encoding='utf-8') as f:
-                json.dump(jobs, f, indent=2)
-            print(f"\n💾 All {len(jobs)} jobs saved to scraped_jobs.json")
+            # Append to the NDJSON output (rotated and compressed automatically)
+            sink = NdjsonSink()
+            sink.write_batch(jobs)
+            print(f"\n💾 All {len(jobs)} jobs appended to {sink.active_path}")
         else:
             print("\n⚠️  No jobs found. Taking screenshots for debugging...")
             
@@ -147,8 +167,11 @@ async def manual_scrape():
             print("📄 Page HTML saved to debug_page.html")
             print("\nPlease share these files so we can fix the selectors!")
         
-        print("\n🔍 Keeping browser open for 30 seconds...")
-        await asyncio.sleep(30)
+        if manager is not None:
+            await manager.save()
+        else:
+            print("\n🔍 Keeping browser open for 30 seconds...")
+            await asyncio.sleep(30)
         
         await browser.close()
         print("✅ Done!")
@@ -0,0 +1,47 @@
+import gzip
+import os
+import re
+import time
+from pathlib import Path
+
+# Raw HTML of every page we scrape, kept so fields can be re-extracted later
+SNAPSHOT_DIR = Path(os.environ.get("UPWORK_SNAPSHOT_DIR", str(Path(__file__).parent / "snapshots")))
+
+
+def save_snapshot(html, job_id=None, kind="detail"):
+    """Archive a page as gzip. Detail pages are keyed by jobId, feed pages by time."""
+    directory = SNAPSHOT_DIR / kind
+    directory.mkdir(parents=True, exist_ok=True)
+
+    name = job_id if job_id else time.strftime("%Y%m%d-%H%M%S")
+    path = directory / f"{name}.html.gz"
+
+    # Write to a temp file first so an interrupted write never leaves half a snapshot
+    tmp_path = path.with_suffix(".tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        f.write(html)
+    os.replace(tmp_path, path)
+    return path
+
+
+def iter_snapshots(kind=None):
+    """Paths of archived snapshots, optionally only 'detail' or 'feed'"""
+    root = SNAPSHOT_DIR / kind if kind else SNAPSHOT_DIR
+    if not root.exists():
+        return []
+    return sorted(p for p in root.rglob("*") if p.name.endswith((".html", ".html.gz")))
+
+
+def read_snapshot(path):
+    """HTML text of a snapshot, compressed or not"""
+    path = Path(path)
+    if path.name.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    return path.read_text(encoding="utf-8")
+
+
+def job_id_from_path(path):
+    """jobId encoded in a detail snapshot's file name, if any"""
+    match = re.match(r"(~0\d+)", Path(path).name)
+    return match.group(1) if match else None
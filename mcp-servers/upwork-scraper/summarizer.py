@@ -0,0 +1,204 @@
+import hashlib
+import json
+import re
+from collections import Counter
+
+import job_store
+
+# Bump when the digest changes so cached summaries are recomputed
+SUMMARIZER_VERSION = 1
+
+# Descriptions up to this long are already short enough to return as the summary
+SHORT_DESCRIPTION = 300
+
+# Tools and platforms that show up in job posts, besides the skills already in the store
+SKILL_TERMS = (
+    "Zoho CRM", "Zoho", "HubSpot", "Salesforce", "GoHighLevel", "Pipedrive", "Monday.com",
+    "Airtable", "Notion", "ClickUp", "Asana", "Trello", "Zapier", "Make.com", "n8n",
+    "Calendly", "Brevo", "Mailchimp", "ActiveCampaign", "Klaviyo", "Stripe", "QuickBooks",
+    "Shopify", "WordPress", "Webflow", "Wix", "Google Sheets", "Google Apps Script", "Excel",
+    "Python", "JavaScript", "TypeScript", "Node.js", "React", "SQL", "PHP", "REST API", "API",
+    "OpenAI", "ChatGPT", "AI", "Power BI", "Tableau", "Twilio", "Slack",
+)
+
+STOPWORDS = set("""
+a about above after again all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers him his how i if in into is it its itself just me more
+most my no nor not now of off on once only or other our ours out over own same she should so
+some such than that the their them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your
+yours us looking need needs want seeking please work job project help someone ideal candidate
+""".split())
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])|\n+")
+_WORD_RE = re.compile(r"[a-z][a-z0-9+.#-]*")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•●▪]|\d+[.)])\s+(.+)$", re.M)
+_DELIVERABLE_RE = re.compile(
+    r"\b(?:deliverables?|you will|you'll|responsibilit\w*|tasks? include|scope|build|set up|setup|"
+    r"create|design|develop|implement|integrate|migrate|automate)\b",
+    re.I,
+)
+_BUDGET_RE = re.compile(
+    r"\$\s?\d[\d,]*(?:\.\d+)?(?:\s?[kK])?(?:\s?(?:-|to)\s?\$?\s?\d[\d,]*(?:\.\d+)?(?:\s?[kK])?)?"
+    r"(?:\s?(?:/|per)\s?(?:hr|hour|month|week|project))?"
+    r"|\b(?:fixed[- ]price|hourly rate|per hour|long[- ]term|ongoing)\b",
+    re.I,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    description_hash TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    digest TEXT NOT NULL
+)
+"""
+
+_skill_patterns = None
+
+
+def split_sentences(text):
+    return [s.strip() for s in _SENTENCE_RE.split(text) if len(s.strip()) > 2]
+
+
+def key_sentences(text, max_sentences=2):
+    """The sentences carrying the most frequent content words, in their original order"""
+    # Bullet points are reported as deliverables, not summary sentences
+    sentences = [s for s in split_sentences(_BULLET_RE.sub("", text)) if not s.endswith(":")]
+    if len(sentences) <= max_sentences:
+        return sentences
+
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+    freq = Counter(words)
+    top = max(freq.values(), default=1)
+
+    scored = []
+    for i, sentence in enumerate(sentences):
+        tokens = [w for w in _WORD_RE.findall(sentence.lower()) if w not in STOPWORDS]
+        if not tokens:
+            continue
+        score = sum(freq[w] / top for w in tokens) / len(tokens) ** 0.5
+        # The opening sentence usually states what the job is
+        if i == 0:
+            score *= 1.5
+        scored.append((score, i))
+
+    chosen = sorted(i for _, i in sorted(scored, reverse=True)[:max_sentences])
+    return [sentences[i] for i in chosen]
+
+
+def _known_skills():
+    """Patterns for the built-in skill terms plus every skill name already in the store"""
+    global _skill_patterns
+
+    if _skill_patterns is None:
+        names = {term: term for term in SKILL_TERMS}
+        conn = job_store.get_connection()
+        for r in conn.execute("SELECT skills FROM jobs WHERE skills IS NOT NULL"):
+            for skill in r["skills"].split(","):
+                skill = skill.strip()
+                if 2 <= len(skill) <= 40:
+                    names.setdefault(skill, skill)
+        # Longest first, so 'Zoho CRM' is found before 'Zoho'
+        _skill_patterns = [
+            (name, re.compile(r"(?<![\w.])" + re.escape(name) + r"(?![\w])", re.I if len(name) > 3 else 0))
+            for name in sorted(names, key=len, reverse=True)
+        ]
+    return _skill_patterns
+
+
+def detect_skills(text):
+    found = []
+    covered = []
+    for name, pattern in _known_skills():
+        for match in pattern.finditer(text):
+            span = match.span()
+            if not any(start <= span[0] and span[1] <= end for start, end in covered):
+                covered.append(span)
+                if name not in found:
+                    found.append(name)
+    return found
+
+
+def deliverables(text, limit=5, skip=()):
+    """Bullet points, or failing that, sentences describing work to be done"""
+    items = [m.group(1).strip() for m in _BULLET_RE.finditer(text)]
+    if not items:
+        items = [s for s in split_sentences(text) if _DELIVERABLE_RE.search(s) and s not in skip]
+    return [item if len(item) <= 160 else item[:157].rstrip() + "..." for item in items[:limit]]
+
+
+def budget_hints(text):
+    hints = []
+    for match in _BUDGET_RE.finditer(text):
+        hint = " ".join(match.group(0).split())
+        if hint.lower() not in (h.lower() for h in hints):
+            hints.append(hint)
+    return hints
+
+
+def digest(description, max_sentences=2):
+    """Compact summary of a job description: key sentences, skills, deliverables and budget hints.
+
+    Empty parts are left out so short descriptions stay short.
+    """
+    if len(description) <= SHORT_DESCRIPTION:
+        summary = split_sentences(description)
+        parts = {"summary": description.strip()}
+    else:
+        summary = key_sentences(description, max_sentences)
+        parts = {"summary": " ".join(summary)}
+    parts["detectedSkills"] = detect_skills(description)
+    parts["deliverables"] = deliverables(description, skip=summary)
+    parts["budgetHints"] = budget_hints(description)
+    return {k: v for k, v in parts.items() if v}
+
+
+def description_hash(description):
+    return hashlib.sha1(description.encode("utf-8")).hexdigest()
+
+
+def digest_many(descriptions):
+    """Digests for a list of descriptions, reusing cached ones by description hash"""
+    conn = job_store.get_connection()
+
+    hashes = [description_hash(d) for d in descriptions]
+    cached = {}
+    unique = list(set(hashes))
+    for start in range(0, len(unique), 500):
+        chunk = unique[start:start + 500]
+        for r in conn.execute(
+            f"SELECT description_hash, digest FROM summaries WHERE version = ? AND description_hash IN ({','.join('?' * len(chunk))})",
+            [SUMMARIZER_VERSION, *chunk],
+        ):
+            cached[r["description_hash"]] = json.loads(r["digest"])
+
+    computed = {}
+    for description, h in zip(descriptions, hashes):
+        if h not in cached and h not in computed:
+            computed[h] = digest(description)
+    if computed:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries (description_hash, version, digest) VALUES (?, ?, ?)",
+                [(h, SUMMARIZER_VERSION, json.dumps(d)) for h, d in computed.items()],
+            )
+
+    return [cached.get(h) or computed[h] for h in hashes]
+
+
+def compact_jobs(jobs):
+    """Job dicts with the description replaced by its digest"""
+    with_text = [job for job in jobs if job.get("description")]
+    digests = digest_many([job["description"] for job in with_text])
+    by_job = {id(job): d for job, d in zip(with_text, digests)}
+
+    compact = []
+    for job in jobs:
+        entry = {k: v for k, v in job.items() if k != "description"}
+        # Fields the page already lists (detail pages have their own deliverables) win
+        for key, value in by_job.get(id(job), {}).items():
+            if not entry.get(key):
+                entry[key] = value
+        compact.append(entry)
+    return compact
@@ -0,0 +1,73 @@
+import os
+import time
+from urllib.parse import urlparse
+
+import metrics
+
+# A page past either limit is replaced with a fresh one between tool calls
+MAX_JS_HEAP_MB = float(os.environ.get("UPWORK_MAX_JS_HEAP_MB", "400"))
+MAX_DOM_NODES = int(os.environ.get("UPWORK_MAX_DOM_NODES", "100000"))
+# How often pages are sampled (0 turns the watchdog off)
+CHECK_SECONDS = float(os.environ.get("UPWORK_WATCHDOG_SECONDS", "60"))
+# After this many page recycles the whole browser context is replaced too
+PAGE_RECYCLES_PER_CONTEXT = int(os.environ.get("UPWORK_PAGE_RECYCLES_PER_CONTEXT", "5"))
+
+
+async def sample_page(page):
+    """JS heap and DOM size of one page, read over CDP without touching the page's own JS"""
+    cdp = await page.context.new_cdp_session(page)
+    try:
+        await cdp.send("Performance.enable")
+        result = await cdp.send("Performance.getMetrics")
+    finally:
+        await cdp.detach()
+
+    values = {m["name"]: m["value"] for m in result["metrics"]}
+    return {
+        "jsHeapMb": values.get("JSHeapUsedSize", 0) / (1024 * 1024),
+        "domNodes": int(values.get("Nodes", 0)),
+        "listeners": int(values.get("JSEventListeners", 0)),
+    }
+
+
+def over_limit(sample):
+    return sample["jsHeapMb"] > MAX_JS_HEAP_MB or sample["domNodes"] > MAX_DOM_NODES
+
+
+class Watchdog:
+    """Samples browser pages now and then and says which have grown too large"""
+
+    def __init__(self):
+        self.last_check = 0
+        self.page_recycles = 0
+
+    def due(self):
+        return CHECK_SECONDS > 0 and time.time() - self.last_check >= CHECK_SECONDS
+
+    async def check(self, pages):
+        """Sample every open page and record it. Returns [(page, sample)] for pages over a limit."""
+        self.last_check = time.time()
+        over = []
+        for page in pages:
+            if page.is_closed():
+                continue
+            try:
+                sample = await sample_page(page)
+            except Exception as e:
+                print(f"⚠️  Could not sample page memory: {e}")
+                continue
+
+            path = urlparse(page.url).path or page.url
+            metrics.record_metric("browser_js_heap_mb", sample["jsHeapMb"], page=path)
+            metrics.record_metric("browser_dom_nodes", sample["domNodes"], page=path)
+            if over_limit(sample):
+                over.append((page, sample))
+        return over
+
+    def context_due(self):
+        """True once enough pages have been recycled that the context itself should go"""
+        return self.page_recycles >= PAGE_RECYCLES_PER_CONTEXT
+
+    def recycled(self, kind, sample=None):
+        self.page_recycles = 0 if kind == "context" else self.page_recycles + 1
+        metrics.record_metric("browser_recycle", 1, kind=kind, **(sample or {}))